@@ -3,6 +3,21 @@ ASGI config for energy project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The public pages (home, services, case studies, legal pages) are async views,
+so under ASGI a slow client no longer holds a whole worker. Run with:
+
+    DATABASE_CONN_MAX_AGE=0 uvicorn energy.asgi:application --workers 4
+
+or, under gunicorn's process management:
+
+    DATABASE_CONN_MAX_AGE=0 gunicorn energy.asgi:application \
+        -k uvicorn.workers.UvicornWorker --workers 4
+
+Persistent connections must be off under ASGI: Django keeps one connection
+per thread, and ASGI requests run their sync code on short-lived threads.
+`python manage.py benchmark_servers` compares this against energy.wsgi.
+CSV exports hand ASGI an async iterator, so they stream under either server.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
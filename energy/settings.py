@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from decouple import config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,7 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # whitenoise's middleware, made async-capable for the ASGI views
+    "power.middleware.AsyncWhiteNoiseMiddleware",
+    "power.perf.ServerTimingMiddleware",
+    "power.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -58,7 +63,8 @@ ROOT_URLCONF = "energy.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates with render timing for the Server-Timing header
+        "BACKEND": "power.perf.TimedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -77,14 +83,162 @@ WSGI_APPLICATION = "energy.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection settings come from the environment (or a .env file), so one
+# codebase runs on the bundled SQLite file or on Postgres:
+#
+#   DATABASE_ENGINE=postgresql  DATABASE_NAME  DATABASE_USER
+#   DATABASE_PASSWORD  DATABASE_HOST  DATABASE_PORT  DATABASE_CONN_MAX_AGE
+#
+# Setting the same variables with a REPLICA_ prefix (REPLICA_DATABASE_NAME,
+# ...) adds a read replica. The reporting views (analytics, dashboard,
+# projects, monthly metrics) then read from it; see power/routers.py.
+
+# SQLite tuned for several gunicorn workers sharing one file, applied to
+# every new connection:
+# - WAL lets readers carry on while a write is in progress
+# - "timeout" is the busy timeout: writers queue for the lock for up to 20s
+#   instead of failing with "database is locked"
+# - IMMEDIATE transactions take the write lock when they begin, so two
+#   transactions can never both read and then deadlock upgrading to write
+# - synchronous=NORMAL is durable in WAL mode except across power loss
+# - mmap and a 64 MB page cache keep hot pages out of read() calls
+# Compare against stock settings with `python manage.py benchmark_sqlite`.
+SQLITE_OPTIONS = {
+    "timeout": 20,
+    "transaction_mode": "IMMEDIATE",
+    "init_command": (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA temp_store=MEMORY;"
+    ),
+}
+
+
+def database_from_env(prefix, default_name=None):
+    engine = config(f"{prefix}_ENGINE", default="sqlite3")
+    database = {
+        "ENGINE": f"django.db.backends.{engine}",
+        "NAME": config(f"{prefix}_NAME", default=default_name),
+        # Keep connections open across requests instead of reconnecting
+        # (and re-running the SQLite pragmas) every time
+        "CONN_MAX_AGE": config(f"{prefix}_CONN_MAX_AGE", default=600, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+    }
+    if engine == "sqlite3":
+        database["OPTIONS"] = SQLITE_OPTIONS
+    else:
+        database.update(
+            USER=config(f"{prefix}_USER", default=""),
+            PASSWORD=config(f"{prefix}_PASSWORD", default=""),
+            HOST=config(f"{prefix}_HOST", default="localhost"),
+            PORT=config(f"{prefix}_PORT", default="5432"),
+        )
+    return database
+
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+    "default": database_from_env("DATABASE", default_name=BASE_DIR / "db.sqlite3"),
+}
+
+if config("REPLICA_DATABASE_NAME", default=""):
+    DATABASES["replica"] = {
+        **database_from_env("REPLICA_DATABASE"),
+        # Tests run against the primary's test database
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["power.routers.PrimaryReplicaRouter"]
+
+# How long a browser keeps reading from the primary after it writes, to cover
+# replication lag
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Cached pages, the dashboard snapshot, chart data and the tag versions that
+# purge them must be shared by every web worker and management command, or a
+# write in one process leaves the others serving stale pages. The default
+# file cache covers workers on one host; set CACHE_BACKEND=redis (needs the
+# redis package) or memcached (needs pymemcache) when running several hosts.
+# locmem only suits a single process, such as runserver.
+
+# CACHE_BACKEND name -> (backend, default CACHE_LOCATION)
+CACHE_BACKENDS = {
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    # Run `python manage.py createcachetable` first
+    "db": ("django.core.cache.backends.db.DatabaseCache", "power_cache"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+    "memcached": ("django.core.cache.backends.memcached.PyMemcacheCache", "127.0.0.1:11211"),
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "kakuskos"),
+}
+
+
+def cache_from_env(prefix):
+    backend, location = CACHE_BACKENDS[config(f"{prefix}_BACKEND", default="file")]
+    cache = {
+        "BACKEND": backend,
+        "LOCATION": config(f"{prefix}_LOCATION", default=location),
+        "KEY_PREFIX": "kakuskos",
     }
+    if not backend.endswith(("RedisCache", "PyMemcacheCache")):
+        # These cull entries at random past MAX_ENTRIES (300 by default),
+        # which is too few for one page per filter combination
+        cache["OPTIONS"] = {
+            "MAX_ENTRIES": config(f"{prefix}_MAX_ENTRIES", default=10000, cast=int)
+        }
+    return cache
+
+
+CACHES = {
+    "default": cache_from_env("CACHE"),
 }
 
 
+# Email
+# https://docs.djangoproject.com/en/5.2/topics/email/
+# Outgoing mail is queued in NotificationJob and sent by
+# `python manage.py run_notification_worker`. For local testing run a
+# debugging SMTP server: python -m aiosmtpd -n -l localhost:1025
+# Production points EMAIL_* at the real SMTP relay through the environment.
+
+EMAIL_HOST = config("EMAIL_HOST", default="localhost")
+EMAIL_PORT = config("EMAIL_PORT", default=1025, cast=int)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=False, cast=bool)
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = "Kakuskos Energy <info@kakuskos.co.ke>"
+
+# Who gets told about new service requests
+STAFF_NOTIFICATION_EMAILS = ["info@kakuskos.co.ke"]
+
+# Scheme and host for absolute links in emails
+SITE_URL = config("SITE_URL", default="https://kakuskos.onrender.com")
+
+
+# Performance budgets checked by power.perf.ServerTimingMiddleware, keyed by
+# URL name. Requests over budget are logged; recent figures are on /adm/perf/.
+
+PERF_BUDGETS = {
+    "default": {"ms": 500, "queries": 20},
+    "home": {"ms": 200, "queries": 5},
+    "all_services": {"ms": 200, "queries": 5},
+    "adm_dashboard": {"ms": 300, "queries": 10},
+    "service_request_list": {"ms": 300, "queries": 10},
+    "project_list": {"ms": 300, "queries": 10},
+}
+
+
+# Audit log retention: `python manage.py archive_admin_logs` moves AdminLog
+# rows older than this into gzipped JSON Lines files under the archive dir
+
+ADMIN_LOG_RETENTION_DAYS = 90
+ADMIN_LOG_ARCHIVE_DIR = BASE_DIR / "archive" / "admin_logs"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -127,6 +281,17 @@ STATICFILES_DIRS = [BASE_DIR / "power/static"]
 # For production use (optional, if using Whitenoise)
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# collectstatic optimizes images, adds WebP copies, fingerprints everything
+# and precompresses text assets for whitenoise (see power/storage.py)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "power.storage.OptimizedStaticFilesStorage",
+    },
+}
+
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
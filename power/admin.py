@@ -11,7 +11,14 @@ class ServiceAdmin(admin.ModelAdmin):
 
 
 class CaseStudyAdmin(admin.ModelAdmin):
-    list_display = ("title", "client_type", "location", "installation_date")
+    list_display = (
+        "title",
+        "client_type",
+        "location",
+        "installation_date",
+        "energy_savings",
+        "savings_percentage",
+    )
     list_filter = ("client_type", "service")
     search_fields = ("title", "client_name", "location")
     readonly_fields = ("energy_savings", "savings_percentage")
@@ -54,8 +61,11 @@ admin.site.register(CaseStudy, CaseStudyAdmin)
 
 # power/admin.py
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import ServiceRequest, AdminLog
+from .models import ServiceRequest, AdminLog, NotificationJob
+from .dashboard import invalidate_dashboard_snapshot
+from . import search
 
 
 class ServiceRequestAdmin(admin.ModelAdmin):
@@ -72,6 +82,14 @@ class ServiceRequestAdmin(admin.ModelAdmin):
     list_editable = ("is_completed",)
     actions = ["mark_as_completed"]
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search.search_terms(search_term):
+            # Nothing the index can use (blank, or only single characters):
+            # the plain LIKE search over search_fields
+            return super().get_search_results(request, queryset, search_term)
+        # The full-text index instead of LIKE '%term%' over search_fields
+        return search.matching(queryset, search_term), False
+
     def service_display(self, obj):
         return obj.get_service_display()
 
@@ -79,6 +97,8 @@ class ServiceRequestAdmin(admin.ModelAdmin):
 
     def mark_as_completed(self, request, queryset):
         queryset.update(is_completed=True)
+        # update() skips the model signals, so drop the dashboard cache here
+        invalidate_dashboard_snapshot()
 
     mark_as_completed.short_description = "Mark selected requests as completed"
 
@@ -97,8 +117,26 @@ class AdminLogAdmin(admin.ModelAdmin):
         return False
 
 
+class NotificationJobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "status", "attempts", "run_after", "sent_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("created_at", "sent_at", "locked_by", "locked_at", "last_error")
+    actions = ["retry_now"]
+
+    def retry_now(self, request, queryset):
+        # RUNNING jobs belong to a worker; re-queueing one would send it twice.
+        # A worker that died is caught by the lock timeout instead.
+        updated = queryset.filter(status__in=["PENDING", "FAILED"]).update(
+            status="PENDING", run_after=timezone.now(), attempts=0
+        )
+        self.message_user(request, f"{updated} notification(s) queued for retry.")
+
+    retry_now.short_description = "Retry selected notifications now"
+
+
 admin.site.register(ServiceRequest, ServiceRequestAdmin)
 admin.site.register(AdminLog, AdminLogAdmin)
+admin.site.register(NotificationJob, NotificationJobAdmin)
 
 
 
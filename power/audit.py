@@ -0,0 +1,86 @@
+# power/audit.py
+import atexit
+import logging
+import threading
+
+from django.db import DatabaseError, connection, transaction
+
+from .dashboard import invalidate_dashboard_snapshot
+from .models import AdminLog
+
+logger = logging.getLogger(__name__)
+
+# Buffered entries are written at most this many seconds after they are
+# logged, or as soon as this many are waiting
+FLUSH_INTERVAL = 2.0
+MAX_BUFFER = 100
+
+_buffer = []
+_lock = threading.Lock()
+_timer = None
+
+
+def log_action(request, action, details):
+    """
+    Record an admin action. Inside a transaction the entry is written, with
+    anything else buffered, as soon as it commits (and dropped if it rolls
+    back, like the change it describes). Outside one it is buffered and
+    flushed by a background timer, off the request path.
+    """
+    entry = AdminLog(
+        admin_user=request.user.get_username(),
+        action=action,
+        details=details,
+        ip_address=request.META.get("REMOTE_ADDR") or None,
+    )
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _add(entry, write_now=True))
+    else:
+        _add(entry)
+
+
+def _add(entry, write_now=False):
+    global _timer
+    with _lock:
+        _buffer.append(entry)
+        write_now = write_now or len(_buffer) >= MAX_BUFFER
+        if not write_now and _timer is None:
+            _timer = threading.Timer(FLUSH_INTERVAL, _flush_from_timer)
+            _timer.daemon = True
+            _timer.start()
+    if write_now:
+        flush()
+
+
+def _flush_from_timer():
+    global _timer
+    with _lock:
+        _timer = None
+    try:
+        flush()
+    finally:
+        # The timer thread gets its own connection; don't leak it
+        connection.close()
+
+
+def flush():
+    """Write every buffered entry with one bulk insert. Returns the count."""
+    with _lock:
+        entries = _buffer[:]
+        _buffer.clear()
+    if not entries:
+        return 0
+    try:
+        AdminLog.objects.bulk_create(entries)
+    except DatabaseError:
+        logger.exception("Could not write %d audit log entries", len(entries))
+        with _lock:
+            # Keep them for the next flush rather than losing the audit trail
+            _buffer[:0] = entries
+        return 0
+    # bulk_create sends no post_save, so drop the dashboard snapshot here
+    invalidate_dashboard_snapshot()
+    return len(entries)
+
+
+atexit.register(flush)
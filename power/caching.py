@@ -0,0 +1,131 @@
+# power/caching.py
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+
+# How long a rendered public page or fragment may be served from cache. Model
+# writes purge entries long before this through their tags.
+PAGE_CACHE_TTL = 60 * 60 * 6
+
+
+def _tag_key(tag):
+    return f"power:tag:{tag}"
+
+
+def tag_version(*tags):
+    """
+    Return a string identifying the current generation of ``tags``.
+
+    Every tag maps to a token in the cache; cache keys built from that token
+    change as soon as any of their tags is invalidated, which is how a single
+    write purges every page and fragment that depends on a model.
+    """
+    if not tags:
+        return "0"
+    keys = [_tag_key(tag) for tag in sorted(tags)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Never restart at a fixed number: an evicted tag must not bring
+            # back entries cached under its old version
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+async def atag_version(*tags):
+    """tag_version for async code, using the cache's async API"""
+    if not tags:
+        return "0"
+    keys = [_tag_key(tag) for tag in sorted(tags)]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def invalidate_tags(*tags):
+    cache.set_many({_tag_key(tag): time.time_ns() for tag in tags}, timeout=None)
+
+
+def cache_public_page(*tags, timeout=PAGE_CACHE_TTL, query_params=None):
+    """
+    Cache the full response of a public view for anonymous GET requests.
+
+    ``tags`` name the models the page depends on (see power/signals.py);
+    saving or deleting one of them purges the page. Responses that set
+    cookies, carry flash messages or are not 200s are never stored.
+
+    Views that read their query string list the parameters they use in
+    ``query_params``; a request carrying any other parameter is not cached,
+    so made-up query strings cannot fill the cache. Every other view is
+    keyed on its path alone, and tracking parameters share its one entry.
+    """
+
+    def page_key(view, request, version):
+        if query_params is None:
+            query = []
+        elif set(request.GET).issubset(query_params):
+            query = [(name, request.GET.getlist(name)) for name in sorted(request.GET)]
+        else:
+            return None
+        path = hashlib.md5(f"{request.path}?{query}".encode()).hexdigest()
+        return f"power:page:{view.__name__}:{version}:{path}"
+
+    def cacheable(response):
+        return response.status_code == 200 and not response.cookies
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            # Async views go through the cache's async API, so a network
+            # cache never blocks the event loop
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await view(request, *args, **kwargs)
+                # auser() loads the session, so the messages check below
+                # never has to hit the database from the event loop
+                user = await request.auser()
+                if user.is_authenticated or len(get_messages(request)):
+                    return await view(request, *args, **kwargs)
+
+                key = page_key(view, request, await atag_version(*tags))
+                if key is None:
+                    return await view(request, *args, **kwargs)
+                response = await cache.aget(key)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                    if cacheable(response):
+                        await cache.aset(key, response, timeout)
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ("GET", "HEAD")
+                or request.user.is_authenticated
+                or len(get_messages(request))
+            ):
+                return view(request, *args, **kwargs)
+
+            key = page_key(view, request, tag_version(*tags))
+            if key is None:
+                return view(request, *args, **kwargs)
+            response = cache.get(key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if cacheable(response):
+                    cache.set(key, response, timeout)
+            return response
+
+        return wrapper
+
+    return decorator
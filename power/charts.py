@@ -0,0 +1,141 @@
+# power/charts.py
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractYear
+
+from .caching import tag_version
+from .models import (
+    CaseStudy,
+    ClientTypeRollup,
+    InstallationProject,
+    MonthlyMetric,
+    ServiceProjectRollup,
+    YearlyProjectRollup,
+)
+
+CHART_CACHE_TTL = 60 * 60
+
+
+def yearly_chart(start=None, end=None):
+    if start or end:
+        # The rollup holds whole years; a date range needs the source rows
+        period = Q()
+        if start:
+            period &= Q(completion_date__gte=start)
+        if end:
+            period &= Q(completion_date__lte=end)
+        rows = [
+            (row["year"], row["total_revenue"], row["total_profit"], row["total_projects"])
+            for row in InstallationProject.objects.filter(period)
+            .values(year=ExtractYear("completion_date"))
+            .annotate(
+                total_projects=Count("id"),
+                total_revenue=Sum("total_cost"),
+                total_profit=Sum("profit"),
+            )
+            .order_by("year")
+        ]
+    else:
+        rows = [
+            (row.year, row.total_revenue, row.total_profit, row.total_projects)
+            for row in YearlyProjectRollup.objects.order_by("year")
+        ]
+    return {
+        "labels": [str(year) for year, _, _, _ in rows],
+        "revenue": [float(revenue or 0) for _, revenue, _, _ in rows],
+        "profit": [float(profit or 0) for _, _, profit, _ in rows],
+        "projects": [projects for _, _, _, projects in rows],
+    }
+
+
+def monthly_chart(start=None, end=None):
+    if start or end:
+        metrics = MonthlyMetric.objects.order_by("month")
+        if start:
+            metrics = metrics.filter(month__gte=start)
+        if end:
+            metrics = metrics.filter(month__lte=end)
+        rows = list(metrics)
+    else:
+        # Last 12 months, oldest first
+        rows = MonthlyMetric.objects.order_by("-month")[:12][::-1]
+    return {
+        "labels": [row.month.strftime("%b %Y") for row in rows],
+        "revenue": [float(row.revenue) for row in rows],
+        "expenses": [float(row.expenses) for row in rows],
+        "profit": [float(row.profit) for row in rows],
+        "new_clients": [row.new_clients for row in rows],
+    }
+
+
+def service_chart(start=None, end=None):
+    if start or end:
+        # The rollup covers all time; a date range needs the source rows
+        period = Q()
+        if start:
+            period &= Q(completion_date__gte=start)
+        if end:
+            period &= Q(completion_date__lte=end)
+        rows = [
+            (row["service_type__title"], row["total_projects"], row["total_profit"])
+            for row in InstallationProject.objects.filter(period)
+            .values("service_type__title")
+            .annotate(total_projects=Count("id"), total_profit=Sum("profit"))
+            .order_by("-total_projects")
+        ]
+    else:
+        rows = [
+            (row.service.title, row.total_projects, row.total_profit)
+            for row in ServiceProjectRollup.objects.select_related("service").order_by(
+                "-total_projects"
+            )
+        ]
+    return {
+        "labels": [title for title, _, _ in rows],
+        "projects": [projects for _, projects, _ in rows],
+        "profit": [float(profit or 0) for _, _, profit in rows],
+    }
+
+
+def client_type_chart(start=None, end=None):
+    labels = dict(CaseStudy.CLIENT_TYPES)
+    if start or end:
+        case_studies = CaseStudy.objects.all()
+        if start:
+            case_studies = case_studies.filter(installation_date__gte=start)
+        if end:
+            case_studies = case_studies.filter(installation_date__lte=end)
+        rows = (
+            case_studies.values_list("client_type")
+            .annotate(total=Count("id"))
+            .order_by("-total")
+        )
+    else:
+        rows = ClientTypeRollup.objects.order_by("-total_case_studies").values_list(
+            "client_type", "total_case_studies"
+        )
+    rows = list(rows)
+    return {
+        "labels": [labels.get(client_type, client_type) for client_type, _ in rows],
+        "case_studies": [total for _, total in rows],
+    }
+
+
+# Chart name -> (builder, models whose writes invalidate it)
+CHARTS = {
+    "yearly": (yearly_chart, ("InstallationProject",)),
+    "monthly": (monthly_chart, ("MonthlyMetric",)),
+    "services": (service_chart, ("InstallationProject", "Service")),
+    "client-types": (client_type_chart, ("CaseStudy",)),
+}
+
+
+def get_chart_data(name, start=None, end=None):
+    """Return one chart's data, cached per chart and date range"""
+    build, tags = CHARTS[name]
+    key = f"power:chart:{name}:{tag_version(*tags)}:{start}:{end}"
+    data = cache.get(key)
+    if data is None:
+        data = build(start, end)
+        cache.set(key, data, CHART_CACHE_TTL)
+    return data
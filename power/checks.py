@@ -0,0 +1,28 @@
+# power/checks.py
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Page and tag invalidation only reach other processes through a shared cache"""
+    if settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process.",
+            hint=(
+                "Cached pages, the dashboard snapshot and chart data are purged "
+                "only in the process that made the change; other workers and "
+                "management commands keep serving stale copies. Set "
+                "CACHE_BACKEND to file, db, redis or memcached, or run a single "
+                "worker process."
+            ),
+            id="power.W001",
+        )
+    ]
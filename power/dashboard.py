@@ -0,0 +1,128 @@
+# power/dashboard.py
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    AdminLog,
+    CaseStudy,
+    InstallationProject,
+    Service,
+    ServiceRequest,
+)
+from .utils import calculate_growth_rate, month_bounds
+
+DASHBOARD_CACHE_KEY = "power:dashboard_snapshot"
+DASHBOARD_CACHE_TTL = 60  # seconds
+
+
+def build_dashboard_snapshot():
+    """Compute every dashboard tile with one aggregate query per model"""
+    now = timezone.now()
+    today = timezone.localdate()
+    last_month, this_month, next_month = month_bounds(now)
+    year_start = this_month.replace(month=1)
+    next_year_start = year_start.replace(year=year_start.year + 1)
+
+    requests = ServiceRequest.objects.aggregate(
+        total=Count("id"),
+        pending=Count("id", filter=Q(is_completed=False)),
+        completed_this_month=Count(
+            "id",
+            filter=Q(
+                is_completed=True,
+                submitted_at__gte=this_month,
+                submitted_at__lt=next_month,
+            ),
+        ),
+    )
+
+    services = Service.objects.aggregate(
+        total=Count("id"),
+        this_month=Count(
+            "id", filter=Q(created_at__gte=this_month, created_at__lt=next_month)
+        ),
+        last_month=Count(
+            "id", filter=Q(created_at__gte=last_month, created_at__lt=this_month)
+        ),
+    )
+
+    case_studies = CaseStudy.objects.aggregate(
+        total=Count("id"),
+        energy_savings=Sum("energy_savings"),
+        this_month=Count(
+            "id",
+            filter=Q(
+                installation_date__gte=this_month.date(),
+                installation_date__lt=next_month.date(),
+            ),
+        ),
+        last_month=Count(
+            "id",
+            filter=Q(
+                installation_date__gte=last_month.date(),
+                installation_date__lt=this_month.date(),
+            ),
+        ),
+    )
+
+    current_year = Q(
+        completion_date__gte=year_start.date(),
+        completion_date__lt=next_year_start.date(),
+    )
+    projects = InstallationProject.objects.aggregate(
+        total=Count("id"),
+        new_this_week=Count(
+            "id", filter=Q(completion_date__gte=today - timedelta(days=7))
+        ),
+        revenue=Sum("total_cost", filter=current_year),
+        profit=Sum("profit", filter=current_year),
+        avg_duration=Avg(
+            ExpressionWrapper(
+                F("completion_date") - F("created_at"), output_field=DurationField()
+            ),
+            filter=current_year,
+        ),
+    )
+
+    return {
+        # Basic counts
+        "total_requests": requests["total"],
+        "pending_requests": requests["pending"],
+        "recent_requests": list(ServiceRequest.objects.order_by("-submitted_at")[:5]),
+        "admin_logs": list(AdminLog.objects.order_by("-timestamp")[:10]),
+        "total_services": services["total"],
+        "total_case_studies": case_studies["total"],
+        "total_energy_savings": case_studies["energy_savings"] or 0,
+        "active_projects": projects["total"],
+        # Calculated metrics
+        "service_growth": calculate_growth_rate(
+            services["this_month"], services["last_month"]
+        ),
+        "case_study_growth": calculate_growth_rate(
+            case_studies["this_month"], case_studies["last_month"]
+        ),
+        "new_projects_this_week": projects["new_this_week"],
+        "completed_requests_this_month": requests["completed_this_month"],
+        "total_revenue": projects["revenue"] or 0,
+        "total_profit": projects["profit"] or 0,
+        "avg_project_duration": (projects["avg_duration"] or timedelta(0)).days,
+        # Time periods
+        "current_month": this_month.strftime("%B"),
+        "last_month": last_month.strftime("%B"),
+    }
+
+
+def get_dashboard_snapshot():
+    """Return the cached dashboard snapshot, building it on a miss"""
+    snapshot = cache.get(DASHBOARD_CACHE_KEY)
+    if snapshot is None:
+        snapshot = build_dashboard_snapshot()
+        cache.set(DASHBOARD_CACHE_KEY, snapshot, DASHBOARD_CACHE_TTL)
+    return snapshot
+
+
+def invalidate_dashboard_snapshot():
+    cache.delete(DASHBOARD_CACHE_KEY)
@@ -0,0 +1,113 @@
+# power/exports.py
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from .forms import ServiceRequestFilterForm
+from .models import InstallationProject, MonthlyMetric, ServiceRequest
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+# Spreadsheet apps run a cell that starts with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    """Quote free text that a spreadsheet would otherwise evaluate"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def unescape_formula(value):
+    """Undo escape_formula, for exports that are edited and imported again"""
+    if isinstance(value, str) and value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the caller"""
+
+    def write(self, value):
+        return value
+
+
+def service_request_rows(request):
+    requests = ServiceRequestFilterForm(request.GET or None).filter_queryset(
+        ServiceRequest.objects.order_by("-submitted_at", "-id")
+    )
+    services = dict(ServiceRequest.SERVICE_CHOICES)
+    yield ["submitted_at", "name", "email", "phone", "service", "message", "status"]
+    for submitted_at, name, email, phone, service, message, completed in requests.values_list(
+        "submitted_at", "name", "email", "phone", "service", "message", "is_completed"
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        # Everything but the timestamp, service and status was typed into the
+        # public booking form
+        yield [
+            submitted_at.isoformat(),
+            escape_formula(name),
+            escape_formula(email),
+            escape_formula(phone),
+            services.get(service, service),
+            escape_formula(message),
+            "Completed" if completed else "Pending",
+        ]
+
+
+# Project and metric exports use the same columns as power/imports.py, so an
+# export can be edited and imported again. Numeric columns are written as is;
+# the import strips the quote escape_formula adds to text.
+
+
+def project_rows(request):
+    columns = ["client_name", "completion_date", "system_size_kw", "total_cost", "profit"]
+    yield columns + ["service_type"]
+    for client_name, *values in (
+        InstallationProject.objects.order_by("-completion_date", "-id")
+        .values_list(*columns, "service_type__slug")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    ):
+        yield [escape_formula(client_name), *values]
+
+
+def metric_rows(request):
+    columns = ["month", "new_clients", "revenue", "expenses"]
+    yield columns
+    yield from (
+        MonthlyMetric.objects.order_by("month")
+        .values_list(*columns)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+EXPORTS = {
+    "service-requests": service_request_rows,
+    "projects": project_rows,
+    "metrics": metric_rows,
+}
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+async def acsv_lines(rows, lines_per_chunk=EXPORT_CHUNK_SIZE):
+    """
+    csv_lines for ASGI. Django would read a sync iterator to the end before
+    sending any of it; this advances it in the request's sync thread, one
+    chunk of lines at a time, so the export still streams.
+    """
+    lines = csv_lines(rows)
+    next_chunk = sync_to_async(lambda: "".join(islice(lines, lines_per_chunk)))
+    while chunk := await next_chunk():
+        yield chunk
+
+
+def export_filename(kind):
+    return f"{kind}-{timezone.localdate():%Y%m%d}.csv"
@@ -0,0 +1,112 @@
+# power/facets.py
+"""
+Facets for the public case study browser (/case-studies/).
+
+CaseStudyFacet holds the number of case studies in every combination of
+client type, service, capacity band and savings band; power/rollups.py keeps
+it up to date. The browser reads that small table once per request and
+derives every facet count from it, instead of counting case studies once
+per facet value.
+"""
+from django.db.models import Case, CharField, Q, Value, When
+
+from .models import CaseStudy, CaseStudyFacet
+
+# (code, label, lower bound, upper bound); lower bounds are inclusive, upper
+# bounds exclusive, and None leaves that end open
+CAPACITY_BANDS = [
+    ("upto-10", "Up to 10 kW", None, 10),
+    ("10-50", "10 - 50 kW", 10, 50),
+    ("50-250", "50 - 250 kW", 50, 250),
+    ("250-plus", "250 kW and above", 250, None),
+]
+SAVINGS_BANDS = [
+    ("under-30", "Under 30%", None, 30),
+    ("30-50", "30 - 50%", 30, 50),
+    ("50-70", "50 - 70%", 50, 70),
+    ("70-plus", "70% and above", 70, None),
+]
+
+# Facet name -> (CaseStudyFacet field, field the bands are drawn on, bands)
+BANDED_FACETS = {
+    "capacity": ("capacity_band", "system_capacity", CAPACITY_BANDS),
+    "savings": ("savings_band", "savings_percentage", SAVINGS_BANDS),
+}
+FACET_FIELDS = {
+    "client_type": "client_type",
+    "service": "service_id",
+    **{name: field for name, (field, _, _) in BANDED_FACETS.items()},
+}
+
+
+def band_filter(field, bands, code):
+    """Q matching the rows of ``field`` that fall in band ``code``"""
+    for band_code, _, low, high in bands:
+        if band_code == code:
+            condition = Q()
+            if low is not None:
+                condition &= Q(**{f"{field}__gte": low})
+            if high is not None:
+                condition &= Q(**{f"{field}__lt": high})
+            return condition
+    raise ValueError(f"Unknown band {code!r} for {field}")
+
+
+def with_bands(queryset):
+    """Annotate case studies with the code of each band they fall in"""
+    return queryset.annotate(
+        **{
+            band_field: Case(
+                *[
+                    When(band_filter(field, bands, code), then=Value(code))
+                    for code, _, _, _ in bands
+                ],
+                output_field=CharField(),
+            )
+            for band_field, field, bands in BANDED_FACETS.values()
+        }
+    )
+
+
+def facet_cell(pk):
+    """The CaseStudyFacet key of case study ``pk``, or None if it is gone"""
+    return (
+        with_bands(CaseStudy.objects.filter(pk=pk))
+        .values_list("client_type", "service_id", "capacity_band", "savings_band")
+        .first()
+    )
+
+
+def filter_case_studies(queryset, selected):
+    """Apply the ``selected`` facet values (facet name -> value) to case studies"""
+    if selected.get("client_type"):
+        queryset = queryset.filter(client_type=selected["client_type"])
+    if selected.get("service"):
+        queryset = queryset.filter(service_id=selected["service"])
+    for name, (_, field, bands) in BANDED_FACETS.items():
+        if selected.get(name):
+            queryset = queryset.filter(band_filter(field, bands, selected[name]))
+    return queryset
+
+
+async def facet_counts(selected):
+    """
+    Count case studies per facet value, plus the total matching ``selected``.
+
+    Each facet is counted with the other facets' selections applied but not
+    its own, so every value shows how many results picking it would give.
+    """
+    counts = {name: {} for name in FACET_FIELDS}
+    total = 0
+    async for cell in CaseStudyFacet.objects.values(*FACET_FIELDS.values(), "total_case_studies"):
+        values = {name: cell[field] for name, field in FACET_FIELDS.items()}
+        mismatched = [
+            name for name, value in values.items()
+            if selected.get(name) and selected[name] != value
+        ]
+        if not mismatched:
+            total += cell["total_case_studies"]
+        for name, value in values.items():
+            if not mismatched or mismatched == [name]:
+                counts[name][value] = counts[name].get(value, 0) + cell["total_case_studies"]
+    return counts, total
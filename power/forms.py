@@ -92,4 +92,180 @@ class MonthlyMetricForm(forms.ModelForm):
         fields = '__all__'
         widgets = {
             'month': forms.DateInput(attrs={'type': 'date'}),
-        }
\ No newline at end of file
+        }
+
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+
+from . import search
+
+
+class ServiceRequestFilterForm(forms.Form):
+    STATUS_CHOICES = [
+        ("", "All statuses"),
+        ("pending", "Pending"),
+        ("completed", "Completed"),
+    ]
+
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(
+            attrs={"type": "search", "placeholder": "Search name, email, phone, message"}
+        ),
+    )
+    status = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
+    service = forms.ChoiceField(
+        choices=[("", "All services")] + ServiceRequest.SERVICE_CHOICES,
+        required=False,
+    )
+    date_from = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    date_to = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+
+    def filter_queryset(self, queryset, include_status=True, include_search=True):
+        """Apply the submitted filters; invalid input leaves the queryset as is"""
+        if not self.is_valid():
+            return queryset
+
+        data = self.cleaned_data
+        if include_search and data["q"]:
+            queryset = search.matching(queryset, data["q"])
+        if include_status and data["status"]:
+            queryset = queryset.filter(is_completed=data["status"] == "completed")
+        if data["service"]:
+            queryset = queryset.filter(service=data["service"])
+        # Plain range comparisons keep the submitted_at index usable
+        if data["date_from"]:
+            queryset = queryset.filter(
+                submitted_at__gte=timezone.make_aware(
+                    datetime.combine(data["date_from"], time.min)
+                )
+            )
+        if data["date_to"]:
+            queryset = queryset.filter(
+                submitted_at__lt=timezone.make_aware(
+                    datetime.combine(data["date_to"] + timedelta(days=1), time.min)
+                )
+            )
+        return queryset
+
+    @property
+    def search_query(self):
+        """The submitted search, or "" when it has no searchable terms"""
+        if not self.is_valid() or not search.search_terms(self.cleaned_data["q"]):
+            return ""
+        return self.cleaned_data["q"]
+
+
+from .facets import CAPACITY_BANDS, SAVINGS_BANDS
+
+
+class CaseStudyFilterForm(forms.Form):
+    """
+    Facet selections for the public case study browser. ``services`` are
+    loaded by the view, so the form itself never queries.
+    """
+
+    client_type = forms.ChoiceField(
+        label="Client",
+        choices=[("", "All clients")] + CaseStudy.CLIENT_TYPES,
+        required=False,
+    )
+    service = forms.ChoiceField(label="Service", required=False)
+    capacity = forms.ChoiceField(
+        label="System size",
+        choices=[("", "Any size")] + [(code, label) for code, label, _, _ in CAPACITY_BANDS],
+        required=False,
+    )
+    savings = forms.ChoiceField(
+        label="Energy savings",
+        choices=[("", "Any savings")] + [(code, label) for code, label, _, _ in SAVINGS_BANDS],
+        required=False,
+    )
+
+    def __init__(self, *args, services, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.services = {service.slug: service for service in services}
+        self.fields["service"].choices = [("", "All services")] + [
+            (service.slug, service.title) for service in services
+        ]
+
+    @property
+    def selected(self):
+        """Valid selections as facet name -> value; invalid ones are ignored"""
+        self.is_valid()
+        selected = {name: value for name, value in self.cleaned_data.items() if value}
+        if "service" in selected:
+            selected["service"] = self.services[selected["service"]].pk
+        return selected
+
+
+
+class ChartRangeForm(forms.Form):
+    """Optional date range for the analytics chart endpoints"""
+
+    start = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+    end = forms.DateField(
+        required=False, widget=forms.DateInput(attrs={"type": "date"})
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start"), cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("The start date must not be after the end date.")
+        return cleaned_data
+
+# CSV import (see power/imports.py). These validate one row at a time with the
+# same rules as the add/edit forms, minus the per-row queries.
+
+
+class InstallationProjectImportForm(InstallationProjectForm):
+    """
+    ``service_type`` is given as a service id or slug and looked up in the
+    preloaded ``services`` map instead of one query per row.
+    """
+
+    service_type = forms.CharField()
+
+    class Meta(InstallationProjectForm.Meta):
+        fields = None
+        exclude = ["service_type"]
+
+    def __init__(self, *args, services, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.services = services
+
+    def clean_service_type(self):
+        value = self.cleaned_data["service_type"].strip()
+        try:
+            return self.services[value]
+        except KeyError:
+            raise forms.ValidationError(f"Unknown service {value!r}")
+
+    def save(self, commit=True):
+        self.instance.service_type = self.cleaned_data["service_type"]
+        return super().save(commit)
+
+
+class MonthlyMetricImportForm(MonthlyMetricForm):
+    """Existing months are updated rather than rejected as duplicates"""
+
+    def validate_unique(self):
+        pass
+
+
+class CsvImportForm(forms.Form):
+    KIND_CHOICES = [
+        ("projects", "Installation projects"),
+        ("metrics", "Monthly metrics"),
+    ]
+
+    kind = forms.ChoiceField(choices=KIND_CHOICES)
+    file = forms.FileField(help_text="UTF-8 CSV with a header row")
@@ -0,0 +1,102 @@
+# power/images.py
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Widths (in px) of the responsive variants generated for uploaded images
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+
+# Output formats, in the order browsers should prefer them
+VARIANT_FORMATS = {
+    "webp": {"format": "WEBP", "quality": 75, "method": 6},
+    "jpg": {"format": "JPEG", "quality": 78, "optimize": True, "progressive": True},
+}
+
+
+def variant_name(name, width, extension):
+    """services/foo.jpg -> services/variants/foo-640w.webp"""
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, "variants", f"{stem}-{width}w.{extension}")
+
+
+def generate_variants(field_file, storage=default_storage):
+    """
+    Write downscaled WebP and JPEG copies of ``field_file`` and return the
+    metadata that gets stored alongside the image.
+
+    Widths larger than the original are skipped so we never upscale; if the
+    original is smaller than every configured width a single variant at its
+    own width is written instead.
+    """
+    field_file.open("rb")
+    try:
+        with Image.open(field_file) as original:
+            original = ImageOps.exif_transpose(original)
+            original.load()
+    finally:
+        field_file.close()
+
+    if original.mode not in ("RGB", "RGBA"):
+        original = original.convert("RGBA" if "transparency" in original.info else "RGB")
+
+    widths = [w for w in VARIANT_WIDTHS if w < original.width] or [original.width]
+    for width in widths:
+        height = round(original.height * width / original.width)
+        resized = original.resize((width, height), Image.Resampling.LANCZOS)
+        for extension, options in VARIANT_FORMATS.items():
+            image = resized
+            if options["format"] == "JPEG" and image.mode != "RGB":
+                image = image.convert("RGB")
+            buffer = BytesIO()
+            image.save(buffer, **options)
+            name = variant_name(field_file.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+
+    return {"source": field_file.name, "widths": widths}
+
+
+def delete_variants(variants, storage=default_storage):
+    for width in (variants or {}).get("widths", []):
+        for extension in VARIANT_FORMATS:
+            name = variant_name(variants["source"], width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+
+
+# Image fields that get responsive variants, mapped to the JSON field that
+# records which variants exist for the current file
+VARIANT_FIELDS = {
+    "Service": {"image": "image_variants"},
+    "CaseStudy": {"featured_image": "featured_image_variants"},
+}
+
+
+def refresh_instance_variants(instance, force=False):
+    """
+    Regenerate variants for every image field on ``instance`` whose file has
+    changed since the variants were last built. Returns True if anything was
+    written.
+    """
+    updates = {}
+    for image_field, variants_field in VARIANT_FIELDS[type(instance).__name__].items():
+        field_file = getattr(instance, image_field)
+        variants = getattr(instance, variants_field) or {}
+        current = field_file.name if field_file else None
+
+        if not force and variants.get("source") == current:
+            continue
+        delete_variants(variants)
+        updates[variants_field] = generate_variants(field_file) if current else {}
+
+    if updates:
+        # update() avoids re-triggering the post_save handler that called us
+        type(instance).objects.filter(pk=instance.pk).update(**updates)
+        for field, value in updates.items():
+            setattr(instance, field, value)
+    return bool(updates)
@@ -0,0 +1,124 @@
+# power/imports.py
+import csv
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import rollups
+from .caching import invalidate_tags
+from .dashboard import invalidate_dashboard_snapshot
+from .exports import unescape_formula
+from .forms import InstallationProjectImportForm, MonthlyMetricImportForm
+from .models import InstallationProject, MonthlyMetric, Service
+
+IMPORT_CHUNK_SIZE = 1000
+
+# Only the first few row errors are kept, so a completely broken file
+# cannot grow the report without bound
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportReport:
+    """Outcome of a CSV import"""
+
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []  # (line number, message)
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def truncated(self):
+        return self.error_count > len(self.errors)
+
+
+def _project_form_kwargs():
+    services = {}
+    for service in Service.objects.only("id", "slug"):
+        services[str(service.pk)] = service
+        services[service.slug] = service
+    return {"services": services}
+
+
+def _write_projects(projects, touched):
+    InstallationProject.objects.bulk_create(projects)
+    for project in projects:
+        touched["years"].add(project.completion_date.year)
+        touched["services"].add(project.service_type_id)
+    return len(projects)
+
+
+def _write_metrics(metrics, touched):
+    # Last row wins when a month appears twice in the same chunk
+    by_month = {metric.month: metric for metric in metrics}
+    MonthlyMetric.objects.bulk_create(
+        by_month.values(),
+        update_conflicts=True,
+        unique_fields=["month"],
+        update_fields=["new_clients", "revenue", "expenses"],
+    )
+    return len(metrics)
+
+
+IMPORT_KINDS = {
+    "projects": (InstallationProjectImportForm, _project_form_kwargs, _write_projects),
+    "metrics": (MonthlyMetricImportForm, dict, _write_metrics),
+}
+
+
+def _format_errors(form):
+    return "; ".join(
+        f"{field}: {' '.join(messages)}" if field != "__all__" else " ".join(messages)
+        for field, messages in form.errors.items()
+    )
+
+
+def import_csv(kind, stream, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate and write the rows of a CSV text ``stream``.
+
+    Rows are read lazily and written ``chunk_size`` at a time, so memory use
+    does not depend on the file size. Invalid rows are reported by line
+    number and skipped; valid rows are imported. Raises ValidationError if
+    the header is missing required columns.
+    """
+    form_class, get_form_kwargs, write = IMPORT_KINDS[kind]
+    form_kwargs = get_form_kwargs()
+    required = [name for name, field in form_class.base_fields.items() if field.required]
+
+    reader = csv.DictReader(stream)
+    missing = [name for name in required if name not in (reader.fieldnames or [])]
+    if missing:
+        raise ValidationError(f"Missing columns: {', '.join(missing)}")
+
+    report = ImportReport()
+    touched = {"years": set(), "services": set()}
+    numbered_rows = ((reader.line_num, row) for row in reader)
+    while chunk := list(islice(numbered_rows, chunk_size)):
+        instances = []
+        for line, row in chunk:
+            report.rows += 1
+            row = {column: unescape_formula(value) for column, value in row.items()}
+            form = form_class(data=row, **form_kwargs)
+            if form.is_valid():
+                instances.append(form.save(commit=False))
+            else:
+                report.add_error(line, _format_errors(form))
+        if instances:
+            with transaction.atomic():
+                report.imported += write(instances, touched)
+
+    # bulk_create bypasses the signals that keep these up to date
+    for year in touched["years"]:
+        rollups.refresh_year(year)
+    for service_id in touched["services"]:
+        rollups.refresh_service(service_id)
+    invalidate_dashboard_snapshot()
+    invalidate_tags(form_class._meta.model.__name__)
+    return report
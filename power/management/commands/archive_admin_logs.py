@@ -0,0 +1,72 @@
+import gzip
+import json
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from power import audit
+from power.dashboard import invalidate_dashboard_snapshot
+from power.models import AdminLog
+
+FIELDS = ("id", "admin_user", "action", "details", "timestamp", "ip_address")
+
+
+class Command(BaseCommand):
+    help = (
+        "Move admin log entries older than the retention period into a gzipped "
+        "JSON Lines archive and delete them from the database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ADMIN_LOG_RETENTION_DAYS,
+            help="Keep entries newer than this many days",
+        )
+        parser.add_argument("--output-dir", default=settings.ADMIN_LOG_ARCHIVE_DIR)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Count what would be archived"
+        )
+
+    def handle(self, *args, **options):
+        audit.flush()
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        old = AdminLog.objects.filter(timestamp__lt=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{old.count()} entries older than {cutoff:%Y-%m-%d} would be archived")
+            return
+
+        # Fix the set of rows up front so entries logged while we run are
+        # neither archived half-way nor deleted unarchived
+        last_id = old.order_by("-id").values_list("id", flat=True).first()
+        if last_id is None:
+            self.stdout.write("Nothing to archive")
+            return
+        rows = old.filter(id__lte=last_id).order_by("id")
+
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f"admin_logs-{timezone.now():%Y%m%d-%H%M%S}.jsonl.gz"
+
+        archived = 0
+        with gzip.open(path, "wt", encoding="utf-8") as archive:
+            for entry in rows.values(*FIELDS).iterator(chunk_size=options["chunk_size"]):
+                entry["timestamp"] = entry["timestamp"].isoformat()
+                archive.write(json.dumps(entry) + "\n")
+                archived += 1
+
+        # Only delete once the archive has been written and closed
+        with transaction.atomic():
+            deleted, _ = rows.delete()
+        invalidate_dashboard_snapshot()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {archived} entries to {path} ({deleted} deleted)")
+        )
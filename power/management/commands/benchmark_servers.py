@@ -0,0 +1,189 @@
+import asyncio
+import importlib.util
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from power import seeding
+from power.models import CaseStudy
+from power.perf import _percentile
+
+
+def server_commands(workers, port):
+    """How each server is started; the ASGI one is the documented entry point"""
+    bind = f"127.0.0.1:{port}"
+    return {
+        "wsgi (gunicorn sync)": [
+            sys.executable, "-m", "gunicorn", "energy.wsgi:application",
+            "--workers", str(workers), "--bind", bind, "--log-level", "warning",
+        ],
+        "asgi (uvicorn)": [
+            sys.executable, "-m", "uvicorn", "energy.asgi:application",
+            "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning", "--no-access-log",
+        ],
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server on port {port} did not start within {timeout}s")
+
+
+async def fetch(port, path, client_delay):
+    """
+    One request from a slow client: connect, then take a random while
+    (exponential, mean ``client_delay``) to send the request, like a phone
+    on a bad network. A sync worker that accepts a slow client waits for it;
+    an event loop serves other connections in the meantime.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        await asyncio.sleep(random.expovariate(1 / client_delay) if client_delay else 0)
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(port, paths, connections_count, seconds, client_delay):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(offset):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(fetch(port, paths[i % len(paths)], client_delay), 30)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                errors += 1
+            else:
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+            i += 1
+
+    await asyncio.gather(*(client(n) for n in range(connections_count)))
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the public pages' throughput under gunicorn (WSGI) and uvicorn "
+        "(ASGI) with many concurrent, slow clients, on a scratch database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--connections", type=int, default=50, help="Concurrent clients")
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.05,
+            help="Mean seconds a client takes to send its request after connecting",
+        )
+
+    def handle(self, *args, **options):
+        for module in ("gunicorn", "uvicorn"):
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f"{module} is not installed")
+
+        scratch = Path(tempfile.mkdtemp(prefix="power-server-bench-"))
+        try:
+            database = scratch / "db.sqlite3"
+            seeding.use_scratch_database(database)
+            seeding.use_scratch_cache(scratch / "cache")
+            call_command("migrate", verbosity=0)
+            seeding.seed(requests=1000, projects=500, case_studies=50, months=24)
+            case_study = CaseStudy.objects.values_list("pk", flat=True).first()
+            connections.close_all()
+
+            paths = ["/", "/services/", f"/case-studies/{case_study}/", "/privacy-policy/"]
+            env = {
+                **os.environ,
+                "DATABASE_NAME": str(database),
+                # Persistent connections are per thread, which ASGI servers
+                # churn through; see energy/asgi.py
+                "DATABASE_CONN_MAX_AGE": "0",
+            }
+            results = {}
+            port = free_port()
+            for number, (name, command) in enumerate(
+                server_commands(options["workers"], port).items()
+            ):
+                # A cache of its own, so the server starts cold and the
+                # real cache is left alone
+                server_env = {
+                    **env,
+                    "CACHE_BACKEND": "file",
+                    "CACHE_LOCATION": str(scratch / f"cache-{number}"),
+                }
+                results[name] = self.run_server(name, command, server_env, port, paths, options)
+        finally:
+            connections.close_all()
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        wsgi, asgi = results.values()
+        if wsgi:
+            self.stdout.write(self.style.SUCCESS(f"ASGI throughput: {asgi / wsgi:.1f}x WSGI"))
+
+    def run_server(self, name, command, env, port, paths, options):
+        # Budget warnings from every request would bury the summary
+        server = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_port(port)
+            latencies, errors = asyncio.run(
+                load(
+                    port,
+                    paths,
+                    options["connections"],
+                    options["seconds"],
+                    options["client_delay"],
+                )
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        throughput = len(latencies) / options["seconds"]
+        latencies = [latency * 1000 for latency in latencies] or [0]
+        self.stdout.write(
+            f"{name}: {throughput:,.0f} req/s, "
+            f"p50 {_percentile(latencies, 0.5):.0f} ms, "
+            f"p95 {_percentile(latencies, 0.95):.0f} ms, "
+            f"p99 {_percentile(latencies, 0.99):.0f} ms, {errors} errors"
+        )
+        return throughput
@@ -0,0 +1,159 @@
+import multiprocessing
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connections, transaction
+from django.db.models import Count
+
+from power import seeding
+from power.models import ServiceRequest
+
+# Stock Django SQLite settings: rollback journal, 5s timeout, deferred
+# transactions and a new connection for every request
+PROFILES = {
+    "default": {
+        "OPTIONS": {"init_command": "PRAGMA journal_mode=DELETE"},
+        "CONN_MAX_AGE": 0,
+    },
+    "production": {
+        "OPTIONS": settings.SQLITE_OPTIONS,
+        "CONN_MAX_AGE": 600,
+    },
+}
+
+
+def read():
+    """What service_request_list does: status counts and the newest page"""
+    dict(
+        ServiceRequest.objects.order_by()
+        .values_list("is_completed")
+        .annotate(total=Count("id"))
+    )
+    list(ServiceRequest.objects.order_by("-submitted_at", "-id")[:25])
+
+
+def write():
+    """
+    A booking POST (the request row, then its notification job on commit)
+    and an admin edit that reads before it writes inside a transaction
+    """
+    ServiceRequest.objects.create(
+        name="Benchmark Client",
+        email="bench@example.com",
+        phone="0700000000",
+        service="SEA",
+        message="Benchmark booking",
+    )
+    with transaction.atomic():
+        pending = (
+            ServiceRequest.objects.filter(is_completed=False).order_by("submitted_at").first()
+        )
+        pending.is_completed = True
+        pending.save(update_fields=["is_completed"])
+
+
+def worker(kind, seconds):
+    """Run one kind of operation for ``seconds``, like a gunicorn worker would"""
+    operation = read if kind == "read" else write
+    done = locked = 0
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            operation()
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        else:
+            done += 1
+            latencies.append(time.perf_counter() - start)
+        # End of "request": honours CONN_MAX_AGE like request_finished does
+        close_old_connections()
+    connections.close_all()
+    return kind, done, locked, latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent read/write throughput on a scratch copy of the "
+        "database, with stock SQLite settings and with settings.SQLITE_OPTIONS"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=4, help="Reading processes")
+        parser.add_argument("--writers", type=int, default=4, help="Writing processes")
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument(
+            "--rows", type=int, default=50_000, help="Service requests to seed first"
+        )
+
+    def handle(self, *args, **options):
+        if connections["default"].vendor != "sqlite":
+            raise CommandError("benchmark_sqlite only applies to SQLite databases")
+        if options["readers"] + options["writers"] < 1:
+            raise CommandError("Nothing to run: give at least one reader or writer")
+
+        scratch = Path(tempfile.mkdtemp(prefix="power-sqlite-bench-"))
+        try:
+            base = scratch / "base.sqlite3"
+            seeding.use_scratch_database(base, **PROFILES["default"])
+            # The forked workers inherit this, so their writes purge nothing real
+            seeding.use_scratch_cache(scratch / "cache")
+            call_command("migrate", verbosity=0)
+            seeding.seed(requests=options["rows"])
+            connections.close_all()
+
+            results = {}
+            for name, profile in PROFILES.items():
+                path = scratch / f"{name}.sqlite3"
+                shutil.copyfile(base, path)
+                seeding.use_scratch_database(path, **profile)
+                results[name] = self.run_profile(options)
+                self.report(name, results[name], options["seconds"])
+        finally:
+            connections.close_all()
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        before, after = results["default"], results["production"]
+        for kind in ("read", "write"):
+            if before[kind]["done"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{kind}s: {after[kind]['done'] / before[kind]['done']:.1f}x throughput"
+                    )
+                )
+
+    def run_profile(self, options):
+        jobs = [("read", options["seconds"])] * options["readers"]
+        jobs += [("write", options["seconds"])] * options["writers"]
+        # Forked workers inherit the configured connection settings, so the
+        # parent must not hand them an open SQLite handle
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(len(jobs)) as pool:
+            outcomes = pool.starmap(worker, jobs)
+
+        totals = {
+            kind: {"done": 0, "locked": 0, "latencies": []} for kind in ("read", "write")
+        }
+        for kind, done, locked, latencies in outcomes:
+            totals[kind]["done"] += done
+            totals[kind]["locked"] += locked
+            totals[kind]["latencies"] += latencies
+        return totals
+
+    def report(self, name, totals, seconds):
+        self.stdout.write(f"{name}:")
+        for kind, total in totals.items():
+            latencies = sorted(total["latencies"]) or [0]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(
+                f"  {kind}s: {total['done'] / seconds:,.0f}/s, "
+                f"p95 {p95 * 1000:.1f} ms, {total['locked']} 'database is locked' errors"
+            )
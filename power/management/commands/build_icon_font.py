@@ -0,0 +1,159 @@
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from power.models import Service
+
+OUTPUT_DIR = Path(settings.BASE_DIR) / "power/static/power/vendor/fontawesome"
+FONT_NAME = "fa-solid-subset.woff2"
+
+# Icons built from template expressions the scanner cannot see
+# (e.g. fa-arrow-{% if growth > 0 %}up{% else %}down{% endif %}), plus a
+# handful of choices offered for Service.icon_class
+EXTRA_ICONS = [
+    "arrow-up",
+    "arrow-down",
+    "solar-panel",
+    "leaf",
+    "headset",
+    "tools",
+    "bolt",
+    "lightbulb",
+    "seedling",
+    "sun",
+    "plug",
+    "chart-line",
+    "clipboard-check",
+    "industry",
+    "house",
+]
+
+# Skips partial names such as fa-arrow-{% if ... %}
+ICON_PATTERN = re.compile(r"\bfa-([a-z0-9]+(?:-[a-z0-9]+)*)(?![\w{-])")
+
+# Utility classes that are not icons
+NON_ICONS = {"solid", "regular", "brands", "spin", "fw", "lg", "2x", "3x"}
+
+BASE_CSS = """\
+/* Font Awesome Free 6 (solid subset) | https://fontawesome.com | License: https://fontawesome.com/license/free
+   Generated by `python manage.py build_icon_font`; do not edit by hand. */
+@font-face {
+  font-family: "Font Awesome 6 Free";
+  font-style: normal;
+  font-weight: 900;
+  font-display: block;
+  src: url("{font}") format("woff2");
+}
+.fa, .fas, .fa-solid {
+  -moz-osx-font-smoothing: grayscale;
+  -webkit-font-smoothing: antialiased;
+  display: inline-block;
+  font-family: "Font Awesome 6 Free";
+  font-style: normal;
+  font-variant: normal;
+  font-weight: 900;
+  line-height: 1;
+  text-rendering: auto;
+}
+.fa-spin { animation: fa-spin 2s linear infinite; }
+@keyframes fa-spin { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
+@media (prefers-reduced-motion: reduce) { .fa-spin { animation: none; } }
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the self-hosted Font Awesome subset (woff2 + CSS) containing only "
+        "the icons used by our templates and services"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            help=(
+                "Path to a Font Awesome Free distribution (the directory holding "
+                "webfonts/ and metadata/). Defaults to the fontawesomefree package."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from fontTools import subset
+        except ImportError:
+            raise CommandError("fonttools and brotli are required: pip install fonttools brotli")
+
+        source = self.find_source(options["source"])
+        metadata = json.loads((source / "metadata/icons.json").read_text())
+
+        # Map every name and legacy alias (e.g. "edit") to its codepoint
+        codepoints = {}
+        for name, icon in metadata.items():
+            if "solid" not in icon["styles"]:
+                continue
+            codepoints[name] = icon["unicode"]
+            for alias in icon.get("aliases", {}).get("names", []):
+                codepoints[alias] = icon["unicode"]
+
+        wanted = self.used_icons()
+        missing = sorted(wanted - codepoints.keys())
+        if missing:
+            self.stderr.write(
+                self.style.WARNING(f"Unknown or non-solid icons skipped: {', '.join(missing)}")
+            )
+        icons = {name: codepoints[name] for name in sorted(wanted) if name in codepoints}
+
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        font_options = subset.Options()
+        font_options.flavor = "woff2"
+        font_options.layout_features = []
+        font_options.name_IDs = ["*"]
+        font = subset.load_font(str(source / "webfonts/fa-solid-900.ttf"), font_options)
+        subsetter = subset.Subsetter(font_options)
+        subsetter.populate(unicodes={int(code, 16) for code in icons.values()})
+        subsetter.subset(font)
+        subset.save_font(font, str(OUTPUT_DIR / FONT_NAME), font_options)
+
+        rules = "".join(
+            f'.fa-{name}::before {{ content: "\\{code}"; }}\n'
+            for name, code in icons.items()
+        )
+        (OUTPUT_DIR / "icons.css").write_text(BASE_CSS.replace("{font}", FONT_NAME) + rules)
+
+        size = (OUTPUT_DIR / FONT_NAME).stat().st_size
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {len(icons)} icons ({size / 1024:.1f} KB woff2)")
+        )
+
+    def find_source(self, source):
+        if source:
+            path = Path(source)
+        else:
+            try:
+                import fontawesomefree
+            except ImportError:
+                raise CommandError("Pass --source or pip install fontawesomefree")
+            path = Path(fontawesomefree.__file__).parent / "static/fontawesomefree"
+
+        if not (path / "metadata/icons.json").exists():
+            raise CommandError(f"No Font Awesome metadata found under {path}")
+        return path
+
+    def used_icons(self):
+        names = set(EXTRA_ICONS)
+        app_dir = Path(settings.BASE_DIR) / "power"
+        for pattern in ("templates/**/*.html", "static/power/*.js", "*.py"):
+            for path in app_dir.glob(pattern):
+                names.update(ICON_PATTERN.findall(path.read_text(encoding="utf-8")))
+
+        # Service icons are editable in the admin, so include whatever is stored
+        try:
+            for icon_class in Service.objects.values_list("icon_class", flat=True):
+                names.update(ICON_PATTERN.findall(icon_class))
+        except DatabaseError:
+            self.stderr.write(self.style.WARNING("Database unavailable; skipping Service icons"))
+
+        return {name for name in names if name not in NON_ICONS}
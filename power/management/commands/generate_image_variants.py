@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from power import images
+from power.models import CaseStudy, Service
+
+
+class Command(BaseCommand):
+    help = "Generate responsive WebP/JPEG variants for service and case study images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild variants even if they are already up to date",
+        )
+
+    def handle(self, *args, **options):
+        built = 0
+        for model in (Service, CaseStudy):
+            for instance in model.objects.iterator():
+                try:
+                    if images.refresh_instance_variants(instance, force=options["force"]):
+                        built += 1
+                        self.stdout.write(f"Built variants for {model.__name__} {instance.pk}")
+                except OSError as e:
+                    self.stderr.write(
+                        self.style.WARNING(f"Skipped {model.__name__} {instance.pk}: {e}")
+                    )
+
+        self.stdout.write(self.style.SUCCESS(f"Updated variants for {built} objects"))
@@ -0,0 +1,38 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from power.imports import IMPORT_CHUNK_SIZE, IMPORT_KINDS, import_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import installation projects or monthly metrics from a CSV file. "
+        "Monthly metrics are upserted on their month."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORT_KINDS))
+        parser.add_argument("path", help="CSV file with a header row")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_csv(options["kind"], stream, options["chunk_size"])
+        except OSError as e:
+            raise CommandError(e)
+        except ValidationError as e:
+            raise CommandError(" ".join(e.messages))
+
+        for line, message in report.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        if report.truncated:
+            self.stderr.write(f"... and {report.error_count - len(report.errors)} more errors")
+
+        style = self.style.SUCCESS if not report.error_count else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"Imported {report.imported} of {report.rows} rows "
+                f"({report.error_count} rejected)"
+            )
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from power import rollups
+from power.models import (
+    CaseStudyFacet,
+    ClientTypeRollup,
+    ServiceProjectRollup,
+    YearlyProjectRollup,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the analytics rollup tables from scratch"
+
+    def handle(self, *args, **options):
+        rollups.rebuild_all()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {YearlyProjectRollup.objects.count()} yearly, "
+                f"{ServiceProjectRollup.objects.count()} service and "
+                f"{ClientTypeRollup.objects.count()} client type rollups, and "
+                f"{CaseStudyFacet.objects.count()} case study facet counts"
+            )
+        )
@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from power import notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued notification emails in batches. Each batch is split across "
+        "a thread pool and every thread reuses one SMTP connection for its share."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the due jobs and exit"
+        )
+
+    def handle(self, *args, **options):
+        worker = notifications.new_worker_id()
+        threads = max(1, options["threads"])
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            while True:
+                jobs = notifications.claim_batch(worker, options["batch_size"])
+                if not jobs:
+                    if options["once"]:
+                        return
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                messages, results = notifications.build_messages(jobs)
+                items = list(messages.items())
+                chunks = [dict(items[i::threads]) for i in range(threads)]
+                for sent in pool.map(notifications.send_messages, filter(None, chunks)):
+                    results.update(sent)
+                notifications.record_results(jobs, results)
+
+                failed = sum(error is not None for error in results.values())
+                self.stdout.write(
+                    f"Processed {len(jobs)} notifications ({failed} failed)"
+                )
@@ -0,0 +1,102 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from power import seeding
+from power.models import Service
+
+
+def parse_weights(value):
+    """"SEA=5,IS=3" -> {"SEA": 5.0, "IS": 3.0}"""
+    codes = {code for code, _ in Service.SERVICE_CHOICES}
+    weights = {}
+    for part in filter(None, value.split(",")):
+        code, _, weight = part.partition("=")
+        code = code.strip().upper()
+        if code not in codes:
+            raise CommandError(f"Unknown service code {code!r}; use one of {', '.join(sorted(codes))}")
+        try:
+            weights[code] = float(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight for {code}: {weight!r}")
+    return weights
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate reproducible synthetic service requests, projects, case studies, "
+        "monthly metrics and admin log entries for load testing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10_000)
+        parser.add_argument("--projects", type=int, default=5_000)
+        parser.add_argument("--case-studies", type=int, default=200)
+        parser.add_argument(
+            "--months", type=int, default=None, help="Monthly metrics to generate (default: --years * 12)"
+        )
+        parser.add_argument("--logs", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data)")
+        parser.add_argument("--years", type=float, default=5, help="How far back the data goes")
+        parser.add_argument(
+            "--growth", type=float, default=0.25, help="Yearly growth in activity (0 = evenly spread)"
+        )
+        parser.add_argument(
+            "--service-weights",
+            type=parse_weights,
+            default={},
+            help='Relative popularity of services, e.g. "CSE=5,IS=3,SEA=2" (others get 1)',
+        )
+        parser.add_argument("--batch-size", type=int, default=seeding.BATCH_SIZE)
+        parser.add_argument(
+            "--database",
+            metavar="PATH",
+            help="SQLite file to seed instead of the configured database (migrated first)",
+        )
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Seed the configured database without asking first",
+        )
+
+    def handle(self, *args, **options):
+        if options["years"] <= 0 or options["growth"] <= -1:
+            raise CommandError("--years must be positive and --growth above -1")
+
+        if options["database"]:
+            seeding.use_scratch_database(options["database"])
+            call_command("migrate", verbosity=0)
+        elif options["interactive"]:
+            confirm = input(
+                "This adds synthetic rows to the configured database, alongside "
+                "any real data in it.\nUse --database PATH to seed a scratch SQLite "
+                "file instead.\n\nType 'yes' to continue, or 'no' to cancel: "
+            )
+            if confirm != "yes":
+                self.stdout.write("Seeding cancelled.")
+                return
+
+        started = time.perf_counter()
+        counts = seeding.seed(
+            requests=options["requests"],
+            projects=options["projects"],
+            case_studies=options["case_studies"],
+            months=options["months"] if options["months"] is not None else int(options["years"] * 12),
+            logs=options["logs"],
+            seed=options["seed"],
+            years=options["years"],
+            growth=options["growth"],
+            service_weights=options["service_weights"],
+            batch_size=options["batch_size"],
+        )
+        elapsed = time.perf_counter() - started
+
+        for model, count in counts.items():
+            self.stdout.write(f"{model}: {count}")
+        total = sum(counts.values())
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+        )
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    from django.db.models import Count, Sum
+    from django.db.models.functions import ExtractYear
+
+    InstallationProject = apps.get_model("power", "InstallationProject")
+    CaseStudy = apps.get_model("power", "CaseStudy")
+
+    apps.get_model("power", "YearlyProjectRollup").objects.bulk_create(
+        apps.get_model("power", "YearlyProjectRollup")(year=item.pop("year"), **item)
+        for item in InstallationProject.objects.values(
+            year=ExtractYear("completion_date")
+        ).annotate(
+            total_projects=Count("id"),
+            total_revenue=Sum("total_cost"),
+            total_profit=Sum("profit"),
+            total_system_size_kw=Sum("system_size_kw"),
+        )
+    )
+    apps.get_model("power", "ServiceProjectRollup").objects.bulk_create(
+        apps.get_model("power", "ServiceProjectRollup")(
+            service_id=item["service_type"],
+            total_projects=item["total_projects"],
+            total_profit=item["total_profit"],
+        )
+        for item in InstallationProject.objects.values("service_type").annotate(
+            total_projects=Count("id"), total_profit=Sum("profit")
+        )
+    )
+    apps.get_model("power", "ClientTypeRollup").objects.bulk_create(
+        apps.get_model("power", "ClientTypeRollup")(
+            client_type=item["client_type"], total_case_studies=item["total"]
+        )
+        for item in CaseStudy.objects.values("client_type").annotate(total=Count("id"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0005_installationproject_created_at_service_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientTypeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_type', models.CharField(choices=[('RES', 'Residential'), ('COM', 'Commercial'), ('IND', 'Industrial')], max_length=3, unique=True)),
+                ('total_case_studies', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-total_case_studies'],
+            },
+        ),
+        migrations.CreateModel(
+            name='YearlyProjectRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(unique=True)),
+                ('total_projects', models.PositiveIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_system_size_kw', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+            options={
+                'ordering': ['year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ServiceProjectRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_projects', models.PositiveIntegerField(default=0)),
+                ('total_profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='project_rollup', to='power.service')),
+            ],
+            options={
+                'ordering': ['-total_projects'],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
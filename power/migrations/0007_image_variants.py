@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0006_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casestudy',
+            name='featured_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
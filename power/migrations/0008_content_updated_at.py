@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0007_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casestudy',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:22
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0009_notification_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminlog',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
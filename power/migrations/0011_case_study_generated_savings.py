@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:31
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0010_adminlog_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='casestudy',
+            name='energy_savings',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('previous_consumption'), '-', models.F('current_consumption')), help_text='Monthly energy savings in kWh', output_field=models.IntegerField()),
+        ),
+        migrations.AddField(
+            model_name='casestudy',
+            name='savings_percentage',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(previous_consumption=0, then=models.Value(0.0)), default=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(models.F('previous_consumption'), '-', models.F('current_consumption')), models.FloatField()), '*', models.Value(100)), '/', models.F('previous_consumption'))), help_text='Savings as a percentage of the previous consumption', output_field=models.FloatField()),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0011_case_study_generated_savings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='installationproject',
+            index=models.Index(fields=['completion_date', 'total_cost', 'profit', 'created_at'], name='project_completion_totals'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['submitted_at'], name='servicereq_submitted'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['is_completed', 'submitted_at'], name='servicereq_status_submitted'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['service', 'submitted_at'], name='servicereq_service_submitted'),
+        ),
+    ]
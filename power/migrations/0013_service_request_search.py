@@ -0,0 +1,94 @@
+from django.db import migrations
+
+# SQLite: an external-content FTS5 table over power_servicerequest, kept in
+# step by triggers (so bulk_create and raw SQL writes are indexed too).
+# bm25 weights rank a name hit above email/phone, and those above the message.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE power_servicerequest_fts USING fts5(
+        name, email, phone, message,
+        content='power_servicerequest', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    INSERT INTO power_servicerequest_fts(power_servicerequest_fts, rank)
+    VALUES ('rank', 'bm25(10.0, 5.0, 5.0, 1.0)')
+    """,
+    """
+    CREATE TRIGGER power_servicerequest_fts_insert
+    AFTER INSERT ON power_servicerequest BEGIN
+        INSERT INTO power_servicerequest_fts(rowid, name, email, phone, message)
+        VALUES (new.id, new.name, new.email, new.phone, new.message);
+    END
+    """,
+    """
+    CREATE TRIGGER power_servicerequest_fts_delete
+    AFTER DELETE ON power_servicerequest BEGIN
+        INSERT INTO power_servicerequest_fts(
+            power_servicerequest_fts, rowid, name, email, phone, message
+        ) VALUES ('delete', old.id, old.name, old.email, old.phone, old.message);
+    END
+    """,
+    # save() rewrites every column; only reindex when searchable text changed
+    """
+    CREATE TRIGGER power_servicerequest_fts_update
+    AFTER UPDATE ON power_servicerequest
+    WHEN old.name IS NOT new.name OR old.email IS NOT new.email
+        OR old.phone IS NOT new.phone OR old.message IS NOT new.message
+    BEGIN
+        INSERT INTO power_servicerequest_fts(
+            power_servicerequest_fts, rowid, name, email, phone, message
+        ) VALUES ('delete', old.id, old.name, old.email, old.phone, old.message);
+        INSERT INTO power_servicerequest_fts(rowid, name, email, phone, message)
+        VALUES (new.id, new.name, new.email, new.phone, new.message);
+    END
+    """,
+    "INSERT INTO power_servicerequest_fts(power_servicerequest_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER power_servicerequest_fts_update",
+    "DROP TRIGGER power_servicerequest_fts_delete",
+    "DROP TRIGGER power_servicerequest_fts_insert",
+    "DROP TABLE power_servicerequest_fts",
+]
+
+# Postgres: a generated tsvector column, maintained by the database on every
+# write, with a GIN index. The 'simple' configuration keeps names, emails and
+# phone numbers intact instead of stemming them as English words.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE power_servicerequest ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(email, '') || ' ' || coalesce(phone, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(message, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX power_servicerequest_search ON power_servicerequest USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX power_servicerequest_search",
+    "ALTER TABLE power_servicerequest DROP COLUMN search_vector",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("power", "0012_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The facet bands as they stood when this migration was written; see
+# power/facets.py for the live definitions
+CAPACITY_BANDS = [
+    ("upto-10", None, 10),
+    ("10-50", 10, 50),
+    ("50-250", 50, 250),
+    ("250-plus", 250, None),
+]
+SAVINGS_BANDS = [
+    ("under-30", None, 30),
+    ("30-50", 30, 50),
+    ("50-70", 50, 70),
+    ("70-plus", 70, None),
+]
+
+
+def band(field, bands):
+    whens = []
+    for code, low, high in bands:
+        condition = models.Q()
+        if low is not None:
+            condition &= models.Q(**{f"{field}__gte": low})
+        if high is not None:
+            condition &= models.Q(**{f"{field}__lt": high})
+        whens.append(models.When(condition, then=models.Value(code)))
+    return models.Case(*whens, output_field=models.CharField())
+
+
+def backfill_facets(apps, schema_editor):
+    CaseStudy = apps.get_model("power", "CaseStudy")
+    CaseStudyFacet = apps.get_model("power", "CaseStudyFacet")
+    CaseStudyFacet.objects.bulk_create(
+        CaseStudyFacet(**item)
+        for item in CaseStudy.objects.annotate(
+            capacity_band=band("system_capacity", CAPACITY_BANDS),
+            savings_band=band("savings_percentage", SAVINGS_BANDS),
+        )
+        .values("client_type", "service_id", "capacity_band", "savings_band")
+        .annotate(total_case_studies=models.Count("id"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('power', '0013_service_request_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseStudyFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_type', models.CharField(choices=[('RES', 'Residential'), ('COM', 'Commercial'), ('IND', 'Industrial')], max_length=3)),
+                ('capacity_band', models.CharField(max_length=10)),
+                ('savings_band', models.CharField(max_length=10)),
+                ('total_case_studies', models.PositiveIntegerField(default=0)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='power.service')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('client_type', 'service', 'capacity_band', 'savings_band'), name='unique_case_study_facet')],
+            },
+        ),
+        migrations.RunPython(backfill_facets, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Cast
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 
@@ -29,6 +30,8 @@ class Service(models.Model):
     # What makes this service unique
     value_proposition = models.TextField()
     image = models.ImageField(upload_to="services/", blank=True, null=True)
+    # Responsive variants of `image`, maintained by power/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     # FontAwesome icon class
     icon_class = models.CharField(max_length=30, default="fas fa-solar-panel")
@@ -36,6 +39,7 @@ class Service(models.Model):
     # Ordering field for display sequence
     display_order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["display_order"]
@@ -89,21 +93,34 @@ class CaseStudy(models.Model):
 
     # Image for display
     featured_image = models.ImageField(upload_to="case_studies/", blank=True)
-
-    def energy_savings(self):
-        """Safely calculate monthly energy savings in kWh"""
-        if (
-            self.previous_consumption is not None
-            and self.current_consumption is not None
-        ):
-            return self.previous_consumption - self.current_consumption
-        return 0  # Or return None if you'd prefer that
-
-    def savings_percentage(self):
-        """Safely calculate percentage savings"""
-        if self.previous_consumption and self.energy_savings() is not None:
-            return (self.energy_savings() / self.previous_consumption) * 100
-        return 0  # Or return None
+    # Responsive variants of `featured_image`, maintained by power/images.py
+    featured_image_variants = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Computed and stored by the database so savings can be sorted, filtered
+    # and aggregated in SQL
+    energy_savings = models.GeneratedField(
+        expression=models.F("previous_consumption") - models.F("current_consumption"),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        help_text="Monthly energy savings in kWh",
+    )
+    savings_percentage = models.GeneratedField(
+        expression=models.Case(
+            models.When(previous_consumption=0, then=models.Value(0.0)),
+            default=Cast(
+                models.F("previous_consumption") - models.F("current_consumption"),
+                models.FloatField(),
+            )
+            * 100
+            / models.F("previous_consumption"),
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+        help_text="Savings as a percentage of the previous consumption",
+    )
 
     def __str__(self):
         return f"{self.title} - {self.get_client_type_display()}"
@@ -140,6 +157,14 @@ from django.utils import timezone
 
 
 class ServiceRequest(models.Model):
+    """
+    A booking from the public site. Migration 0013 indexes name, email,
+    phone and message for full-text search (power/search.py); on SQLite that
+    relies on triggers that any schema change rebuilding this table drops.
+    They are recreated after every migrate, so run migrations through
+    `manage.py migrate` rather than by hand.
+    """
+
     SERVICE_CHOICES = [
         ("SEA", "Smart Energy Assessment"),
         ("CSE", "Custom Solar & Efficiency Plan"),
@@ -157,6 +182,21 @@ class ServiceRequest(models.Model):
     submitted_at = models.DateTimeField(default=timezone.now)
     is_completed = models.BooleanField(default=False)
 
+    class Meta:
+        # Shaped after service_request_list and the dashboard: every filter
+        # combination is followed by ORDER BY submitted_at DESC, id DESC,
+        # which the trailing submitted_at column (plus the implicit rowid)
+        # satisfies without a sort
+        indexes = [
+            models.Index(fields=["submitted_at"], name="servicereq_submitted"),
+            models.Index(
+                fields=["is_completed", "submitted_at"], name="servicereq_status_submitted"
+            ),
+            models.Index(
+                fields=["service", "submitted_at"], name="servicereq_service_submitted"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.get_service_display()}"
 
@@ -172,7 +212,9 @@ class AdminLog(models.Model):
     admin_user = models.CharField(max_length=100)
     action = models.CharField(max_length=6, choices=ACTION_CHOICES)
     details = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens rather than on insert, since entries are
+    # written in batches by power.audit
+    timestamp = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
 
     class Meta:
@@ -195,6 +237,17 @@ class InstallationProject(models.Model):
     service_type = models.ForeignKey("Service", on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves the keyset listing on project_list, the year-range
+            # rollup refreshes, and (as a covering index) the revenue,
+            # profit and duration aggregates on project_list and the dashboard
+            models.Index(
+                fields=["completion_date", "total_cost", "profit", "created_at"],
+                name="project_completion_totals",
+            ),
+        ]
+
     def year(self):
         return self.completion_date.year
 
@@ -208,3 +261,117 @@ class MonthlyMetric(models.Model):
     @property
     def profit(self):
         return self.revenue - self.expenses
+
+
+# Precomputed rollups read by the analytics page. They are kept up to date by
+# the signal handlers in power/signals.py and can be rebuilt from scratch with
+# `python manage.py rebuild_rollups`.
+
+
+class YearlyProjectRollup(models.Model):
+    year = models.PositiveIntegerField(unique=True)
+    total_projects = models.PositiveIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_profit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_system_size_kw = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
+    class Meta:
+        ordering = ["year"]
+
+    @property
+    def avg_system_size(self):
+        if not self.total_projects:
+            return 0
+        return self.total_system_size_kw / self.total_projects
+
+    def __str__(self):
+        return f"{self.year}: {self.total_projects} projects"
+
+
+class ServiceProjectRollup(models.Model):
+    service = models.OneToOneField(
+        "Service", on_delete=models.CASCADE, related_name="project_rollup"
+    )
+    total_projects = models.PositiveIntegerField(default=0)
+    total_profit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-total_projects"]
+
+    def __str__(self):
+        return f"{self.service}: {self.total_projects} projects"
+
+
+class ClientTypeRollup(models.Model):
+    client_type = models.CharField(
+        max_length=3, choices=CaseStudy.CLIENT_TYPES, unique=True
+    )
+    total_case_studies = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-total_case_studies"]
+
+    def __str__(self):
+        return f"{self.get_client_type_display()}: {self.total_case_studies}"
+
+
+class CaseStudyFacet(models.Model):
+    """
+    Case study count for one combination of the public browser's facets
+    (see power/facets.py), maintained by power/rollups.py
+    """
+
+    client_type = models.CharField(max_length=3, choices=CaseStudy.CLIENT_TYPES)
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="+")
+    capacity_band = models.CharField(max_length=10)
+    savings_band = models.CharField(max_length=10)
+    total_case_studies = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["client_type", "service", "capacity_band", "savings_band"],
+                name="unique_case_study_facet",
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_client_type_display()} / {self.service_id} / "
+            f"{self.capacity_band} / {self.savings_band}: {self.total_case_studies}"
+        )
+
+
+class NotificationJob(models.Model):
+    """Durable queue of outgoing emails, drained by `run_notification_worker`"""
+
+    KIND_CHOICES = [
+        ("NEW_REQUEST", "New service request"),
+    ]
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("SENT", "Sent"),
+        ("FAILED", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} ({self.get_status_display()})"
@@ -0,0 +1,144 @@
+# power/notifications.py
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import NotificationJob, ServiceRequest
+
+MAX_ATTEMPTS = 5
+
+# A RUNNING job whose worker has been silent this long is assumed dead and
+# may be claimed again
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def retry_delay(attempts):
+    """1, 2, 4, 8... minutes between attempts"""
+    return timedelta(minutes=2 ** (attempts - 1))
+
+
+def enqueue_new_request(service_request):
+    """Queue the staff notification once the booking has been committed."""
+
+    def create():
+        NotificationJob.objects.create(
+            kind="NEW_REQUEST", payload={"service_request_id": service_request.pk}
+        )
+
+    transaction.on_commit(create)
+
+
+def claim_batch(worker, size):
+    """
+    Mark up to ``size`` due jobs as RUNNING for ``worker`` and return them.
+
+    SQLite has no SELECT ... FOR UPDATE SKIP LOCKED, so the claim is a single
+    conditional UPDATE: whichever worker flips the status first owns the job.
+    """
+    now = timezone.now()
+    due = NotificationJob.objects.filter(
+        Q(status="PENDING", run_after__lte=now)
+        | Q(status="RUNNING", locked_at__lt=now - LOCK_TIMEOUT)
+    )
+    ids = list(due.order_by("run_after", "id").values_list("id", flat=True)[:size])
+    if not ids:
+        return []
+    due.filter(id__in=ids).update(status="RUNNING", locked_by=worker, locked_at=now)
+    return list(NotificationJob.objects.filter(id__in=ids, status="RUNNING", locked_by=worker))
+
+
+def build_messages(jobs):
+    """
+    Render ``jobs`` into emails. Returns ``(messages, results)``: the
+    messages to send keyed by job id, and the outcome of jobs that need no
+    delivery (``None``) or could not be rendered (an error string).
+    """
+    request_ids = [
+        job.payload.get("service_request_id") for job in jobs if job.kind == "NEW_REQUEST"
+    ]
+    service_requests = ServiceRequest.objects.in_bulk(request_ids)
+    # Mail clients need an absolute link
+    review_url = settings.SITE_URL.rstrip("/") + reverse("service_request_list")
+
+    messages, results = {}, {}
+    for job in jobs:
+        if job.kind != "NEW_REQUEST":
+            results[job.id] = f"Unknown notification kind {job.kind!r}"
+            continue
+        service_request = service_requests.get(job.payload.get("service_request_id"))
+        if service_request is None:
+            # The request was deleted before we got to it
+            results[job.id] = None
+            continue
+        messages[job.id] = EmailMessage(
+            subject=f"New service request from {service_request.name}",
+            body=(
+                f"Name: {service_request.name}\n"
+                f"Email: {service_request.email}\n"
+                f"Phone: {service_request.phone}\n"
+                f"Service: {service_request.get_service_display()}\n"
+                f"Submitted: {service_request.submitted_at:%Y-%m-%d %H:%M}\n\n"
+                f"{service_request.message}\n\n"
+                f"Review it at {review_url}"
+            ),
+            to=settings.STAFF_NOTIFICATION_EMAILS,
+            reply_to=[service_request.email],
+        )
+    return messages, results
+
+
+def send_messages(messages):
+    """
+    Deliver ``{job_id: message}`` over one SMTP connection and return
+    ``{job_id: error}`` (``None`` for success). Safe to call from a worker
+    thread: it never touches the database.
+    """
+    results = {}
+    try:
+        with get_connection() as connection:
+            for job_id, message in messages.items():
+                message.connection = connection
+                try:
+                    message.send()
+                    results[job_id] = None
+                except Exception as e:
+                    results[job_id] = str(e) or type(e).__name__
+    except Exception as e:
+        # Could not open (or cleanly close) the connection
+        error = str(e) or type(e).__name__
+        for job_id in messages:
+            results.setdefault(job_id, error)
+    return results
+
+
+def record_results(jobs, results):
+    now = timezone.now()
+    for job in jobs:
+        error = results[job.id]
+        job.attempts += 1
+        job.locked_by = ""
+        job.locked_at = None
+        if error is None:
+            job.status = "SENT"
+            job.sent_at = now
+            job.last_error = ""
+        else:
+            job.last_error = error
+            if job.attempts >= MAX_ATTEMPTS:
+                job.status = "FAILED"
+            else:
+                job.status = "PENDING"
+                job.run_after = now + retry_delay(job.attempts)
+    NotificationJob.objects.bulk_update(
+        jobs, ["status", "attempts", "locked_by", "locked_at", "last_error", "sent_at", "run_after"]
+    )
+
+
+def new_worker_id():
+    return uuid.uuid4().hex
@@ -0,0 +1,110 @@
+# power/pagination.py
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+PAGE_SIZE = 50
+
+
+class KeysetPage:
+    """One page of a keyset (cursor) paginated queryset, newest first"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(value, pk):
+    raw = f"{value.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, field):
+    """Turn a cursor back into a (value, pk) pair, or None if it is invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit("|", 1)
+        return field.to_python(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+        return None
+
+
+def keyset_paginate(queryset, field_name, after=None, before=None, page_size=PAGE_SIZE):
+    """
+    Paginate ``queryset`` on ``(field_name, id)`` in descending order.
+
+    ``after`` continues past the last row of the previous page and ``before``
+    walks back from the first row of the current one. Each page costs a
+    single indexed range query no matter how deep into the table it is.
+    """
+    field = queryset.model._meta.get_field(field_name)
+    after = decode_cursor(after, field) if after else None
+    before = decode_cursor(before, field) if before else None
+
+    if before:
+        value, pk = before
+        rows = list(
+            queryset.filter(
+                Q(**{f"{field_name}__gt": value})
+                | Q(**{field_name: value, "id__gt": pk})
+            ).order_by(field_name, "id")[: page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next, has_previous = True, has_more
+    else:
+        if after:
+            value, pk = after
+            queryset = queryset.filter(
+                Q(**{f"{field_name}__lt": value})
+                | Q(**{field_name: value, "id__lt": pk})
+            )
+        rows = list(queryset.order_by(f"-{field_name}", "-id")[: page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_previous = after is not None
+
+    if not rows:
+        return KeysetPage(rows)
+
+    first, last = rows[0], rows[-1]
+    return KeysetPage(
+        rows,
+        next_cursor=(
+            encode_cursor(getattr(last, field_name), last.pk) if has_next else None
+        ),
+        previous_cursor=(
+            encode_cursor(getattr(first, field_name), first.pk)
+            if has_previous
+            else None
+        ),
+    )
+
+
+class CountedPaginator(Paginator):
+    """
+    A numbered Paginator given its total up front, for lists whose size is
+    already known from a rollup table, so it never runs a COUNT query
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
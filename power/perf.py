@@ -0,0 +1,219 @@
+# power/perf.py
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+# Most recent requests kept for /adm/perf/. Each worker process keeps its own.
+HISTORY_SIZE = 1000
+
+_history = deque(maxlen=HISTORY_SIZE)
+_history_lock = threading.Lock()
+_current = ContextVar("power_request_timings", default=None)
+
+
+class RequestTimings:
+    """Counters for one request, filled in by the hooks below"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Database execute_wrapper: time every query on every connection
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+                f"render;dur={self.render_time * 1000:.1f}",
+                f"total;dur={self.total_time * 1000:.1f}",
+            ]
+        )
+
+
+def _time_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings(execute, sql, params, many, context)
+
+
+def install_query_timer(connection, **kwargs):
+    """
+    Time every query on ``connection`` for the request in progress.
+
+    The wrapper stays installed for the connection's lifetime and finds the
+    request through a context variable, so it also covers async views,
+    whose queries run on connections opened in sync_to_async threads.
+    """
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(install_query_timer)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.render_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The stock Django template backend, with top-level renders timed for
+    ServerTimingMiddleware. Included templates render inside their parent,
+    so nothing is counted twice.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+def get_budget(view_name):
+    budgets = getattr(settings, "PERF_BUDGETS", {})
+    return {**budgets.get("default", {}), **budgets.get(view_name, {})}
+
+
+class ServerTimingMiddleware:
+    """
+    Measure query count, database time and template render time for every
+    request, send them as a Server-Timing header, log requests that go over
+    their budget (settings.PERF_BUDGETS) and remember them for /adm/perf/.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Connections opened before this module was imported
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        timings.total_time = time.perf_counter() - timings.started
+        response["Server-Timing"] = timings.server_timing()
+        match = request.resolver_match
+        view_name = (match.url_name or match.view_name) if match else "unresolved"
+        self.record(request, response, view_name, timings)
+        return response
+
+    def record(self, request, response, view_name, timings):
+        total_ms = timings.total_time * 1000
+        budget = get_budget(view_name)
+        over_budget = total_ms > budget.get("ms", float("inf")) or timings.queries > budget.get(
+            "queries", float("inf")
+        )
+        if over_budget:
+            logger.warning(
+                "%s %s (%s) over budget: %.0f ms, %d queries, %.0f ms in the database "
+                "(budget %s ms, %s queries)",
+                request.method,
+                request.path,
+                view_name,
+                total_ms,
+                timings.queries,
+                timings.db_time * 1000,
+                budget.get("ms", "-"),
+                budget.get("queries", "-"),
+            )
+        with _history_lock:
+            _history.append(
+                {
+                    "view": view_name,
+                    "status": response.status_code,
+                    "total_ms": total_ms,
+                    "db_ms": timings.db_time * 1000,
+                    "render_ms": timings.render_time * 1000,
+                    "queries": timings.queries,
+                    "over_budget": over_budget,
+                }
+            )
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def recent_stats():
+    """Per-view summary of the requests in this process's history"""
+    with _history_lock:
+        history = list(_history)
+
+    by_view = {}
+    for entry in history:
+        by_view.setdefault(entry["view"], []).append(entry)
+
+    stats = []
+    for view, entries in by_view.items():
+        count = len(entries)
+        totals = [entry["total_ms"] for entry in entries]
+        stats.append(
+            {
+                "view": view,
+                "requests": count,
+                "avg_ms": sum(totals) / count,
+                "p95_ms": _percentile(totals, 0.95),
+                "max_ms": max(totals),
+                "avg_db_ms": sum(entry["db_ms"] for entry in entries) / count,
+                "avg_render_ms": sum(entry["render_ms"] for entry in entries) / count,
+                "avg_queries": sum(entry["queries"] for entry in entries) / count,
+                "max_queries": max(entry["queries"] for entry in entries),
+                "over_budget": sum(entry["over_budget"] for entry in entries),
+                "budget": get_budget(view),
+            }
+        )
+    stats.sort(key=lambda row: row["p95_ms"], reverse=True)
+    return stats, len(history)
@@ -0,0 +1,146 @@
+# power/rollups.py
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractYear
+
+from . import facets
+from .models import (
+    CaseStudy,
+    CaseStudyFacet,
+    ClientTypeRollup,
+    InstallationProject,
+    ServiceProjectRollup,
+    YearlyProjectRollup,
+)
+
+
+def refresh_year(year):
+    """Recompute the rollup row for a single completion year"""
+    totals = InstallationProject.objects.filter(
+        completion_date__year=year
+    ).aggregate(
+        total_projects=Count("id"),
+        total_revenue=Sum("total_cost"),
+        total_profit=Sum("profit"),
+        total_system_size_kw=Sum("system_size_kw"),
+    )
+    if not totals["total_projects"]:
+        YearlyProjectRollup.objects.filter(year=year).delete()
+        return
+
+    YearlyProjectRollup.objects.update_or_create(
+        year=year,
+        defaults={
+            "total_projects": totals["total_projects"],
+            "total_revenue": totals["total_revenue"] or 0,
+            "total_profit": totals["total_profit"] or 0,
+            "total_system_size_kw": totals["total_system_size_kw"] or 0,
+        },
+    )
+
+
+def refresh_service(service_id):
+    """Recompute the project rollup row for a single service"""
+    totals = InstallationProject.objects.filter(service_type_id=service_id).aggregate(
+        total_projects=Count("id"), total_profit=Sum("profit")
+    )
+    if not totals["total_projects"]:
+        ServiceProjectRollup.objects.filter(service_id=service_id).delete()
+        return
+
+    ServiceProjectRollup.objects.update_or_create(
+        service_id=service_id,
+        defaults={
+            "total_projects": totals["total_projects"],
+            "total_profit": totals["total_profit"] or 0,
+        },
+    )
+
+
+def refresh_client_type(client_type):
+    """Recompute the case study count for a single client type"""
+    total = CaseStudy.objects.filter(client_type=client_type).count()
+    if not total:
+        ClientTypeRollup.objects.filter(client_type=client_type).delete()
+        return
+
+    ClientTypeRollup.objects.update_or_create(
+        client_type=client_type, defaults={"total_case_studies": total}
+    )
+
+
+def refresh_case_study_facet(client_type, service_id, capacity_band, savings_band):
+    """Recompute the count for a single combination of case study facets"""
+    total = CaseStudy.objects.filter(
+        facets.band_filter("system_capacity", facets.CAPACITY_BANDS, capacity_band),
+        facets.band_filter("savings_percentage", facets.SAVINGS_BANDS, savings_band),
+        client_type=client_type,
+        service_id=service_id,
+    ).count()
+    cell = {
+        "client_type": client_type,
+        "service_id": service_id,
+        "capacity_band": capacity_band,
+        "savings_band": savings_band,
+    }
+    if not total:
+        CaseStudyFacet.objects.filter(**cell).delete()
+        return
+
+    CaseStudyFacet.objects.update_or_create(
+        **cell, defaults={"total_case_studies": total}
+    )
+
+
+@transaction.atomic
+def rebuild_all():
+    """Throw away every rollup row and rebuild them from the source tables"""
+    YearlyProjectRollup.objects.all().delete()
+    ServiceProjectRollup.objects.all().delete()
+    ClientTypeRollup.objects.all().delete()
+    CaseStudyFacet.objects.all().delete()
+
+    YearlyProjectRollup.objects.bulk_create(
+        YearlyProjectRollup(
+            year=item["year"],
+            total_projects=item["total_projects"],
+            total_revenue=item["total_revenue"] or 0,
+            total_profit=item["total_profit"] or 0,
+            total_system_size_kw=item["total_system_size_kw"] or 0,
+        )
+        for item in InstallationProject.objects.values(
+            year=ExtractYear("completion_date")
+        ).annotate(
+            total_projects=Count("id"),
+            total_revenue=Sum("total_cost"),
+            total_profit=Sum("profit"),
+            total_system_size_kw=Sum("system_size_kw"),
+        )
+    )
+
+    ServiceProjectRollup.objects.bulk_create(
+        ServiceProjectRollup(
+            service_id=item["service_type"],
+            total_projects=item["total_projects"],
+            total_profit=item["total_profit"] or 0,
+        )
+        for item in InstallationProject.objects.values("service_type").annotate(
+            total_projects=Count("id"), total_profit=Sum("profit")
+        )
+    )
+
+    ClientTypeRollup.objects.bulk_create(
+        ClientTypeRollup(
+            client_type=item["client_type"], total_case_studies=item["total"]
+        )
+        for item in CaseStudy.objects.values("client_type").annotate(
+            total=Count("id")
+        )
+    )
+
+    CaseStudyFacet.objects.bulk_create(
+        CaseStudyFacet(**item)
+        for item in facets.with_bands(CaseStudy.objects.all())
+        .values("client_type", "service_id", "capacity_band", "savings_band")
+        .annotate(total_case_studies=Count("id"))
+    )
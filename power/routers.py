@@ -0,0 +1,129 @@
+# power/routers.py
+"""
+Send the reporting views' reads to the "replica" database.
+
+Only views wrapped in ``reporting_view`` read from the replica, and only for
+models in this app. Everything else stays on the primary, including:
+
+- every write
+- reads inside a transaction
+- reads later in a request that has already written
+- reads in requests from a browser that wrote within the last
+  REPLICA_PIN_SECONDS, so an admin who adds a project and is redirected to
+  the project list sees it even if the replica lags behind
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+PIN_COOKIE = "power_primary"
+
+_state = ContextVar("power_db_routing", default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.reporting = False
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def reporting_view(view):
+    """Read this view's power models from the replica when one is configured"""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        state = _state.get()
+        if state is None:
+            return view(request, *args, **kwargs)
+        state.reporting = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            state.reporting = False
+
+    return wrapper
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Track reads and writes per request for PrimaryReplicaRouter, and pin the
+    browser to the primary for a while after it writes
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin(response, state)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin(response, state)
+
+    def pin(self, response, state):
+        if state.wrote and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.reporting
+            or state.pinned
+            or state.wrote
+            or model._meta.app_label != "power"
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or not replica_configured()
+        ):
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary along with the data
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,166 @@
+# power/search.py
+"""
+Full-text search over service requests' name, email, phone and message.
+
+SQLite uses the FTS5 table and Postgres the generated tsvector column set up
+in migration 0013; the database keeps either in step with every write.
+Every word of the query is matched as a prefix, so "wanj 0712" finds
+"Wanjiru Kimani, 0712 345 678". Other databases fall back to LIKE.
+"""
+import logging
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Relevance has no stable cursor to page on, so a search shows one page of
+# best matches
+SEARCH_RESULTS = 50
+
+FTS_TABLE = "power_servicerequest_fts"
+
+logger = logging.getLogger(__name__)
+
+# The triggers that keep FTS_TABLE in step on SQLite, as created by migration
+# 0013. SQLite rebuilds a table for most schema changes and drops its
+# triggers along the way, so restore_sqlite_triggers() puts them back after
+# every migrate.
+SQLITE_TRIGGERS = {
+    "power_servicerequest_fts_insert": f"""
+        CREATE TRIGGER power_servicerequest_fts_insert
+        AFTER INSERT ON power_servicerequest BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, email, phone, message)
+            VALUES (new.id, new.name, new.email, new.phone, new.message);
+        END
+    """,
+    "power_servicerequest_fts_delete": f"""
+        CREATE TRIGGER power_servicerequest_fts_delete
+        AFTER DELETE ON power_servicerequest BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, phone, message)
+            VALUES ('delete', old.id, old.name, old.email, old.phone, old.message);
+        END
+    """,
+    "power_servicerequest_fts_update": f"""
+        CREATE TRIGGER power_servicerequest_fts_update
+        AFTER UPDATE ON power_servicerequest
+        WHEN old.name IS NOT new.name OR old.email IS NOT new.email
+            OR old.phone IS NOT new.phone OR old.message IS NOT new.message
+        BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, phone, message)
+            VALUES ('delete', old.id, old.name, old.email, old.phone, old.message);
+            INSERT INTO {FTS_TABLE}(rowid, name, email, phone, message)
+            VALUES (new.id, new.name, new.email, new.phone, new.message);
+        END
+    """,
+}
+
+
+def restore_sqlite_triggers(using):
+    """
+    Recreate any missing FTS trigger on database ``using`` and rebuild the
+    index, which may have missed writes while they were gone. Returns the
+    names of the triggers that had to be restored.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s OR name IN (%s, %s, %s)",
+            [FTS_TABLE, *SQLITE_TRIGGERS],
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+        if FTS_TABLE not in existing:
+            # Migrated back past 0013
+            return []
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    if missing:
+        logger.warning("Restored search triggers dropped by a migration: %s", ", ".join(missing))
+    return missing
+
+
+def search_terms(query):
+    # Single characters would prefix-match most of the inbox
+    return [term for term in re.findall(r"\w+", query) if len(term) > 1]
+
+
+def _fts5_query(terms):
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _postgres_search(queryset, terms):
+    # Imported here: django.contrib.postgres needs a Postgres driver
+    from django.contrib.postgres.search import SearchQuery, SearchVectorField
+
+    vector = RawSQL(
+        f"{queryset.model._meta.db_table}.search_vector", [], output_field=SearchVectorField()
+    )
+    tsquery = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms), search_type="raw", config="simple"
+    )
+    return vector, tsquery
+
+
+def matching(queryset, query):
+    """Requests in ``queryset`` that match every word of ``query``"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [_fts5_query(terms)],
+            )
+        )
+    if vendor == "postgresql":
+        vector, tsquery = _postgres_search(queryset, terms)
+        return queryset.alias(search_document=vector).filter(search_document=tsquery)
+
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term)
+            | Q(email__icontains=term)
+            | Q(phone__icontains=term)
+            | Q(message__icontains=term)
+        )
+    return queryset
+
+
+def ranked(queryset, query, limit=SEARCH_RESULTS):
+    """The best ``limit`` requests in ``queryset`` matching ``query``, best first"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.order_by("-submitted_at")[:limit]
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        # Join the FTS table rather than filtering with matching(), so the
+        # index drives the query and bm25 ranks each row (lower is better)
+        table = queryset.model._meta.db_table
+        queryset = queryset.extra(
+            select={"search_rank": f"{FTS_TABLE}.rank"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[_fts5_query(terms)],
+            order_by=["search_rank", f"-{table}.submitted_at"],
+        )
+    elif vendor == "postgresql":
+        from django.contrib.postgres.search import SearchRank
+
+        vector, tsquery = _postgres_search(queryset, terms)
+        queryset = (
+            matching(queryset, query)
+            .annotate(search_rank=SearchRank(vector, tsquery))
+            .order_by("-search_rank", "-submitted_at")
+        )
+    else:
+        queryset = matching(queryset, query).order_by("-submitted_at")
+    return queryset[:limit]
@@ -0,0 +1,291 @@
+# power/seeding.py
+"""
+Synthetic data for load testing and benchmarks (`manage.py seed_data`).
+
+Everything is drawn from one seeded ``random.Random``, so the same options
+always produce the same rows. Rows are generated lazily and written with
+``bulk_create`` in batches, which keeps memory flat at millions of rows.
+"""
+import math
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import rollups
+from .caching import invalidate_tags
+from .dashboard import invalidate_dashboard_snapshot
+from .models import (
+    AdminLog,
+    CaseStudy,
+    InstallationProject,
+    MonthlyMetric,
+    Service,
+    ServiceRequest,
+)
+
+BATCH_SIZE = 5000
+
+FIRST_NAMES = [
+    "Wanjiru", "Otieno", "Achieng", "Kamau", "Njeri", "Mwangi", "Akinyi",
+    "Kiprop", "Wambui", "Mutua", "Chebet", "Omondi", "Nyambura", "Kariuki",
+]
+LAST_NAMES = [
+    "Kimani", "Odhiambo", "Mutiso", "Waweru", "Koech", "Onyango", "Ndungu",
+    "Wekesa", "Macharia", "Kiplagat", "Owino", "Gitau",
+]
+LOCATIONS = [
+    "Nairobi", "Mombasa", "Kisumu", "Nakuru", "Eldoret", "Thika", "Nyeri",
+    "Machakos", "Naivasha", "Kitale",
+]
+MESSAGES = [
+    "We would like a quote for a rooftop solar system.",
+    "Our electricity bill has doubled, can you assess our usage?",
+    "Interested in battery backup for frequent outages.",
+    "Please contact me about an ESG roadmap for our company.",
+    "Looking for help sizing a system for our factory.",
+]
+
+# Typical system size (kW) and cost per kW for each client type
+CLIENT_PROFILES = {
+    "RES": {"weight": 6, "size": (3, 15), "cost_per_kw": (90_000, 130_000)},
+    "COM": {"weight": 3, "size": (15, 150), "cost_per_kw": (80_000, 110_000)},
+    "IND": {"weight": 1, "size": (100, 1000), "cost_per_kw": (65_000, 95_000)},
+}
+
+
+class Distribution:
+    """
+    Draws timestamps and services for synthetic rows.
+
+    Activity grows by ``growth`` per year over the last ``years`` years
+    (0 means evenly spread), and services are picked with ``service_weights``
+    (service code -> relative weight).
+    """
+
+    def __init__(self, rng, years=5, growth=0.25, service_weights=None, now=None):
+        self.rng = rng
+        self.now = now or timezone.now()
+        self.span = timedelta(days=365.25 * years)
+        self.start = self.now - self.span
+        self.rate = math.log1p(growth) * years  # growth over the whole span
+        weights = service_weights or {}
+        self.service_codes = [code for code, _ in Service.SERVICE_CHOICES]
+        self.service_weights = [weights.get(code, 1) for code in self.service_codes]
+
+    def moment(self):
+        """A datetime in the window, denser towards the present"""
+        u = self.rng.random()
+        if self.rate:
+            fraction = math.log1p(u * math.expm1(self.rate)) / self.rate
+        else:
+            fraction = u
+        return self.start + self.span * fraction
+
+    def day(self):
+        return timezone.localtime(self.moment()).date()
+
+    def service_code(self):
+        return self.rng.choices(self.service_codes, self.service_weights)[0]
+
+    def client_type(self):
+        types = list(CLIENT_PROFILES)
+        return self.rng.choices(types, [CLIENT_PROFILES[t]["weight"] for t in types])[0]
+
+    def person(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+
+def ensure_services():
+    """Make sure every service pillar exists; return them keyed by code"""
+    services = {service.service_type: service for service in Service.objects.all()}
+    for order, (code, title) in enumerate(Service.SERVICE_CHOICES):
+        if code not in services:
+            services[code] = Service.objects.create(
+                service_type=code,
+                slug=slugify(title),
+                title=title,
+                description=f"{title} for homes and businesses.",
+                value_proposition="Lower bills and a smaller footprint.",
+                display_order=order,
+            )
+    return services
+
+
+def service_request_rows(dist, count):
+    rng = dist.rng
+    for i in range(count):
+        name = dist.person()
+        submitted_at = dist.moment()
+        yield ServiceRequest(
+            name=name,
+            email=f"{slugify(name)}.{i}@example.com",
+            phone=f"07{rng.randrange(10**8):08d}",
+            service="OTH" if rng.random() < 0.05 else dist.service_code(),
+            message=rng.choice(MESSAGES),
+            submitted_at=submitted_at,
+            # Older requests are much more likely to have been handled
+            is_completed=rng.random() < min(0.97, (dist.now - submitted_at).days / 60),
+        )
+
+
+def _system(dist, client_type):
+    profile = CLIENT_PROFILES[client_type]
+    size = Decimal(str(round(dist.rng.uniform(*profile["size"]), 2)))
+    cost = (size * dist.rng.randint(*profile["cost_per_kw"])).quantize(Decimal("0.01"))
+    return size, cost
+
+
+def project_rows(dist, count, services):
+    rng = dist.rng
+    for _ in range(count):
+        client_type = dist.client_type()
+        size, cost = _system(dist, client_type)
+        yield InstallationProject(
+            client_name=dist.person(),
+            completion_date=dist.day(),
+            system_size_kw=size,
+            total_cost=cost,
+            profit=(cost * Decimal(str(round(rng.uniform(0.12, 0.3), 3)))).quantize(
+                Decimal("0.01")
+            ),
+            service_type=services[dist.service_code()],
+        )
+
+
+def case_study_rows(dist, count, services):
+    rng = dist.rng
+    for _ in range(count):
+        client_type = dist.client_type()
+        size, cost = _system(dist, client_type)
+        previous = int(size * rng.randint(90, 140))
+        yield CaseStudy(
+            title=f"{dict(CaseStudy.CLIENT_TYPES)[client_type]} solar in {rng.choice(LOCATIONS)}",
+            client_name=dist.person(),
+            client_type=client_type,
+            location=rng.choice(LOCATIONS),
+            installation_date=dist.day(),
+            system_capacity=size,
+            project_cost=cost,
+            previous_consumption=previous,
+            current_consumption=int(previous * rng.uniform(0.3, 0.8)),
+            testimonial="The savings showed up on the very first bill.",
+            service=services[dist.service_code()],
+        )
+
+
+def metric_rows(dist, months):
+    rng = dist.rng
+    first = timezone.localdate(dist.now).replace(day=1)
+    for back in range(months - 1, -1, -1):
+        year, month = divmod(first.year * 12 + first.month - 1 - back, 12)
+        # Revenue follows the same growth curve as the other rows
+        trend = math.exp(dist.rate * (1 - back / max(months, 1)))
+        revenue = Decimal(str(round(rng.uniform(2.5e6, 3.5e6) * trend, 2)))
+        yield MonthlyMetric(
+            month=date(year, month + 1, 1),
+            new_clients=max(1, int(rng.gauss(20, 5) * trend)),
+            revenue=revenue,
+            expenses=(revenue * Decimal(str(round(rng.uniform(0.6, 0.85), 3)))).quantize(
+                Decimal("0.01")
+            ),
+        )
+
+
+def admin_log_rows(dist, count):
+    rng = dist.rng
+    actions = [code for code, _ in AdminLog.ACTION_CHOICES]
+    for _ in range(count):
+        yield AdminLog(
+            admin_user=rng.choice(["admin", "operations", "finance"]),
+            action=rng.choices(actions, [3, 10, 1, 1])[0],
+            details=f"Synthetic entry for {dist.person()}",
+            timestamp=dist.moment(),
+            ip_address=f"10.0.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+        )
+
+
+def use_scratch_database(path, **options):
+    """
+    Point the default connection at the SQLite file ``path`` (benchmarks
+    build their data there, never in the real database). ``options``
+    override connection settings such as OPTIONS and CONN_MAX_AGE.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.close()
+    connection.settings_dict.update(NAME=str(path), **options)
+
+
+def use_scratch_cache(path):
+    """
+    Point the default cache at a file cache in directory ``path``, so the
+    tags seeding bumps (and whatever a benchmark caches) stay out of the
+    real cache.
+    """
+    caches[DEFAULT_CACHE_ALIAS].close()
+    caches.settings[DEFAULT_CACHE_ALIAS] = {
+        **caches.settings[DEFAULT_CACHE_ALIAS],
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(path),
+    }
+    del caches[DEFAULT_CACHE_ALIAS]
+
+
+def write(model, rows, batch_size=BATCH_SIZE, **options):
+    """bulk_create ``rows`` (any iterable) ``batch_size`` at a time"""
+    written = 0
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        with transaction.atomic():
+            if options.get("ignore_conflicts"):
+                # Skipped rows are not reported back, so count what landed
+                before = model.objects.count()
+                model.objects.bulk_create(batch, **options)
+                written += model.objects.count() - before
+            else:
+                model.objects.bulk_create(batch, **options)
+                written += len(batch)
+    return written
+
+
+def seed(
+    requests=0,
+    projects=0,
+    case_studies=0,
+    months=0,
+    logs=0,
+    seed=42,
+    years=5,
+    growth=0.25,
+    service_weights=None,
+    batch_size=BATCH_SIZE,
+):
+    """Generate the requested number of rows and return counts per model"""
+    dist = Distribution(random.Random(seed), years, growth, service_weights)
+    services = ensure_services()
+    counts = {
+        "ServiceRequest": write(ServiceRequest, service_request_rows(dist, requests), batch_size),
+        "InstallationProject": write(
+            InstallationProject, project_rows(dist, projects, services), batch_size
+        ),
+        "CaseStudy": write(CaseStudy, case_study_rows(dist, case_studies, services), batch_size),
+        "MonthlyMetric": write(
+            MonthlyMetric,
+            metric_rows(dist, months),
+            batch_size,
+            # Months that already have figures keep them
+            ignore_conflicts=True,
+        ),
+        "AdminLog": write(AdminLog, admin_log_rows(dist, logs), batch_size),
+    }
+
+    # bulk_create skips the signals that maintain these
+    rollups.rebuild_all()
+    invalidate_dashboard_snapshot()
+    invalidate_tags(*counts)
+    return counts
@@ -0,0 +1,137 @@
+# power/signals.py
+import logging
+
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import facets, images, notifications, rollups, search
+from .caching import invalidate_tags
+from .dashboard import invalidate_dashboard_snapshot
+from .models import (
+    CaseStudy,
+    InstallationProject,
+    MonthlyMetric,
+    Service,
+    ServiceRequest,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Remember the rollup buckets a row belonged to before it is saved, so that
+# moving a project to another year or service refreshes both buckets.
+@receiver(pre_save, sender=InstallationProject)
+def remember_project_buckets(sender, instance, **kwargs):
+    instance._previous_buckets = None
+    if instance.pk:
+        instance._previous_buckets = (
+            InstallationProject.objects.filter(pk=instance.pk)
+            .values_list("completion_date", "service_type_id")
+            .first()
+        )
+
+
+@receiver(post_save, sender=InstallationProject)
+@receiver(post_delete, sender=InstallationProject)
+def refresh_project_rollups(sender, instance, **kwargs):
+    years = {instance.completion_date.year}
+    services = {instance.service_type_id}
+    previous = getattr(instance, "_previous_buckets", None)
+    if previous:
+        years.add(previous[0].year)
+        services.add(previous[1])
+
+    for year in years:
+        rollups.refresh_year(year)
+    for service_id in services:
+        rollups.refresh_service(service_id)
+
+
+# Case studies are remembered by their facet cell (see power/facets.py),
+# whose first entry is also the client type bucket
+@receiver(pre_save, sender=CaseStudy)
+@receiver(pre_delete, sender=CaseStudy)
+def remember_case_study_bucket(sender, instance, **kwargs):
+    instance._previous_facet_cell = facets.facet_cell(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_delete, sender=CaseStudy)
+def refresh_case_study_rollups(sender, instance, **kwargs):
+    cells = {getattr(instance, "_previous_facet_cell", None)}
+    if kwargs["signal"] is post_save:
+        cells.add(facets.facet_cell(instance.pk))
+    cells.discard(None)
+
+    for client_type in {instance.client_type} | {cell[0] for cell in cells}:
+        rollups.refresh_client_type(client_type)
+    for cell in cells:
+        rollups.refresh_case_study_facet(*cell)
+
+
+# Any write to a model shown on the admin dashboard drops the cached snapshot.
+# AdminLog is left out: power.audit writes it in bulk and drops the snapshot
+# itself, and without receivers archive_admin_logs can delete in one query.
+DASHBOARD_MODELS = (ServiceRequest, Service, CaseStudy, InstallationProject)
+
+
+def drop_dashboard_snapshot(sender, **kwargs):
+    invalidate_dashboard_snapshot()
+
+
+for model in DASHBOARD_MODELS:
+    post_save.connect(
+        drop_dashboard_snapshot, sender=model, dispatch_uid=f"dashboard_{model.__name__}"
+    )
+    post_delete.connect(
+        drop_dashboard_snapshot, sender=model, dispatch_uid=f"dashboard_{model.__name__}"
+    )
+
+
+# Responsive image variants for uploaded service and case study images
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=CaseStudy)
+def refresh_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        images.refresh_instance_variants(instance)
+    except OSError:
+        # A missing or unreadable upload should not break the save; the
+        # templates fall back to the original file until the variants exist
+        logger.exception("Could not build image variants for %r", instance)
+
+
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=CaseStudy)
+def delete_image_variants(sender, instance, **kwargs):
+    for variants_field in images.VARIANT_FIELDS[sender.__name__].values():
+        images.delete_variants(getattr(instance, variants_field))
+
+
+# Purge cached pages, fragments and chart data tagged with the changed model.
+# Connected last so it runs after the image variant handler above has
+# written its update.
+def purge_model_tag(sender, **kwargs):
+    invalidate_tags(sender.__name__)
+
+
+for model in (Service, CaseStudy, InstallationProject, MonthlyMetric):
+    post_save.connect(purge_model_tag, sender=model, dispatch_uid=f"tags_{model.__name__}")
+    post_delete.connect(purge_model_tag, sender=model, dispatch_uid=f"tags_{model.__name__}")
+
+
+# Tell staff about new bookings. The email itself is sent by
+# `run_notification_worker`, so the booking form never waits on SMTP.
+@receiver(post_save, sender=ServiceRequest)
+def queue_new_request_notification(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.enqueue_new_request(instance)
+
+
+# SQLite drops a table's triggers whenever a migration rebuilds it, which
+# would silently stop the service request search index from updating
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.label == "power":
+        search.restore_sqlite_triggers(using)
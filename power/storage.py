@@ -0,0 +1,77 @@
+# power/storage.py
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+def webp_name(path):
+    """power/images/proj.jpg -> power/images/proj.webp"""
+    return os.path.splitext(path)[0] + ".webp"
+
+
+class OptimizedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    WhiteNoise's compressed manifest storage with an image stage in front.
+
+    During collectstatic every JPEG/PNG is downscaled to fit ``image_max_size``
+    (or its entry in ``image_max_sizes``, for images only ever shown small),
+    re-encoded, and given a WebP sibling before the usual hashing and
+    gzip/brotli steps run. The optimized bytes are always produced from the
+    source file, so repeated collectstatic runs do not degrade quality.
+    Hashed names let WhiteNoise serve them with far-future immutable headers.
+    """
+
+    image_extensions = (".jpg", ".jpeg", ".png")
+    image_max_size = 1600  # longest edge, in px
+    # Per-file overrides of image_max_size; the header logo is shown 50px tall
+    image_max_sizes = {
+        "power/images/logo.png": 240,
+    }
+    jpeg_quality = 80
+    webp_quality = 75
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            for path, (storage, source_path) in list(paths.items()):
+                if not path.lower().endswith(self.image_extensions):
+                    continue
+                self.optimize_image(storage, source_path, path)
+                # Point hashing at the optimized copy instead of the source
+                paths[path] = (self, path)
+                paths[webp_name(path)] = (self, webp_name(path))
+
+        yield from super().post_process(paths, dry_run, **options)
+
+    def optimize_image(self, storage, source_path, path):
+        with storage.open(source_path) as source, Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+
+        max_size = self.image_max_sizes.get(path, self.image_max_size)
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+        if path.lower().endswith(".png"):
+            self._replace(path, image, format="PNG", optimize=True)
+        else:
+            self._replace(
+                path,
+                image.convert("RGB"),
+                format="JPEG",
+                quality=self.jpeg_quality,
+                optimize=True,
+                progressive=True,
+            )
+        self._replace(
+            webp_name(path), image, format="WEBP", quality=self.webp_quality, method=6
+        )
+
+    def _replace(self, path, image, **save_options):
+        buffer = BytesIO()
+        image.save(buffer, **save_options)
+        if self.exists(path):
+            self.delete(path)
+        self._save(path, ContentFile(buffer.getvalue()))
@@ -0,0 +1,118 @@
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from power.images import VARIANT_FORMATS, variant_name
+from power.storage import webp_name
+
+register = template.Library()
+
+MIME_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+
+
+def build_srcset(variants, extension):
+    return ", ".join(
+        f"{default_storage.url(variant_name(variants['source'], width, extension))} {width}w"
+        for width in variants["widths"]
+    )
+
+
+@register.simple_tag
+def responsive_image(field_file, variants, sizes="100vw", alt="", css_class="", loading="lazy"):
+    """
+    Render ``field_file`` as a <picture> with WebP and JPEG srcsets.
+
+    Usage::
+
+        {% responsive_image service.image service.image_variants sizes="(max-width: 768px) 100vw, 50vw" alt=service.title css_class="service-image" %}
+
+    Falls back to a plain <img> of the original upload when no variants have
+    been generated for the current file yet.
+    """
+    if not field_file:
+        return ""
+
+    if not variants or variants.get("source") != field_file.name:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            field_file.url,
+            alt,
+            css_class,
+            loading,
+        )
+
+    fallback = "jpg"
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[extension], build_srcset(variants, extension), sizes)
+            for extension in VARIANT_FORMATS
+            if extension != fallback
+        ),
+    )
+    largest = variant_name(variants["source"], variants["widths"][-1], fallback)
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" '
+        'loading="{}" decoding="async"></picture>',
+        sources,
+        default_storage.url(largest),
+        build_srcset(variants, fallback),
+        sizes,
+        alt,
+        css_class,
+        loading,
+    )
+
+
+@lru_cache(maxsize=None)
+def static_webp_url(path):
+    """URL of the WebP copy collectstatic made for ``path``, or None"""
+    webp = webp_name(path)
+    if not staticfiles_storage.exists(webp):
+        return None
+    return staticfiles_storage.url(webp)
+
+
+@register.simple_tag
+def static_picture(path, alt="", css_class="", loading="lazy"):
+    """
+    Render a static image as a <picture> preferring its WebP copy::
+
+        {% static_picture 'power/images/proj.jpg' alt="Project 1" %}
+    """
+    img = format_html(
+        '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+        static(path),
+        alt,
+        css_class,
+        loading,
+    )
+    webp = static_webp_url(path)
+    if not webp:
+        return img
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}">{}</picture>', webp, img
+    )
+
+
+@register.simple_tag
+def static_image_set(path):
+    """
+    CSS background value for a static image, preferring its WebP copy::
+
+        background-image: {% static_image_set 'power/images/bay.jpg' %};
+    """
+    webp = static_webp_url(path)
+    if not webp:
+        return format_html('url("{}")', static(path))
+    return format_html(
+        'image-set(url("{}") type("image/webp"), url("{}") type("{}"))',
+        webp,
+        static(path),
+        "image/png" if path.lower().endswith(".png") else "image/jpeg",
+    )
@@ -1,3 +1,503 @@
-from django.test import TestCase
+import json
+import logging
+import os
+import re
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models.fields.files import FieldFile
+from django.forms import model_to_dict
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import notifications, search, seeding
+from . import urls as power_urls
+from .dashboard import build_dashboard_snapshot
+from .models import (
+    AdminLog,
+    CaseStudy,
+    InstallationProject,
+    MonthlyMetric,
+    NotificationJob,
+    Service,
+    ServiceRequest,
+)
+from .perf import _percentile
+
+# Tables that grow without bound and must never be read with a plain table
+# scan. A scan of a covering index is accepted: it is how whole-table
+# aggregates avoid reading the rows themselves.
+HOT_TABLES = (
+    "power_servicerequest",
+    "power_installationproject",
+    "power_adminlog",
+    "power_notificationjob",
+)
+FULL_SCAN = re.compile(rf"^SCAN ({'|'.join(HOT_TABLES)})\b(?! USING (COVERING )?INDEX)")
+
+
+# The manifest storage needs a collectstatic run; tests only render pages
+PLAIN_STATIC_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+@override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+class QueryPlanTests(TestCase):
+    """
+    Run the hot paths in power.views and friends, then EXPLAIN every query
+    they issued and fail if any of them reads a hot table with a full scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        service = Service.objects.create(
+            title="Solar", slug="solar", description="Solar", icon_class="fa-sun"
+        )
+        today = date.today()
+        InstallationProject.objects.bulk_create(
+            InstallationProject(
+                client_name=f"Client {i}",
+                completion_date=today - timedelta(days=7 * i),
+                system_size_kw=5,
+                total_cost=1000,
+                profit=200,
+                service_type=service,
+            )
+            for i in range(120)
+        )
+        ServiceRequest.objects.bulk_create(
+            ServiceRequest(
+                name=f"Client {i}",
+                email=f"client{i}@example.com",
+                phone="0700000000",
+                service="SEA" if i % 2 else "OTH",
+                message="Hello",
+                submitted_at=timezone.now() - timedelta(hours=i),
+                is_completed=i % 3 == 0,
+            )
+            for i in range(120)
+        )
+        AdminLog.objects.bulk_create(
+            AdminLog(admin_user="admin", action="EDIT", details=str(i)) for i in range(30)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def query_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoFullScans(self, captured):
+        checked = 0
+        for query in captured:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT") or not any(
+                table in sql for table in HOT_TABLES
+            ):
+                continue
+            checked += 1
+            plan = self.query_plan(sql)
+            scans = [step for step in plan if FULL_SCAN.search(step)]
+            self.assertFalse(scans, f"Full table scan in:\n{sql}\nPlan: {plan}")
+        self.assertTrue(checked, "No queries against hot tables were captured")
+
+    def assertViewHasNoFullScans(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoFullScans(captured)
+
+    def test_service_request_list(self):
+        self.assertViewHasNoFullScans("/adm/service-requests/")
+
+    def test_service_request_list_filtered(self):
+        for query in (
+            "?status=pending",
+            "?status=completed&service=SEA",
+            "?service=OTH",
+            f"?date_from={date.today() - timedelta(days=2)}&date_to={date.today()}",
+            f"?status=pending&date_from={date.today() - timedelta(days=2)}",
+        ):
+            with self.subTest(query=query):
+                self.assertViewHasNoFullScans(f"/adm/service-requests/{query}")
+
+    def test_service_request_list_next_page(self):
+        response = self.client.get("/adm/service-requests/?status=pending")
+        cursor = response.context["page"].next_cursor
+        self.assertViewHasNoFullScans(f"/adm/service-requests/?status=pending&after={cursor}")
+
+    def test_service_request_search(self):
+        for query in ("?q=client", "?q=cli+exam&status=pending", "?q=0700&service=SEA"):
+            with self.subTest(query=query):
+                self.assertViewHasNoFullScans(f"/adm/service-requests/{query}")
+
+    def test_search_triggers_installed(self):
+        # Without them the search index silently stops following writes
+        self.assertEqual(search.restore_sqlite_triggers(connection.alias), [])
+        request = ServiceRequest.objects.order_by("pk").first()
+        request.name = "Zebedee Otieno"
+        request.save()
+        self.assertIn(request, search.matching(ServiceRequest.objects.all(), "zebedee"))
+
+    def test_project_list(self):
+        self.assertViewHasNoFullScans("/adm/projects/")
+
+    def test_project_list_next_page(self):
+        cursor = self.client.get("/adm/projects/").context["page"].next_cursor
+        self.assertViewHasNoFullScans(f"/adm/projects/?after={cursor}")
+
+    def test_dashboard_snapshot(self):
+        with CaptureQueriesContext(connection) as captured:
+            build_dashboard_snapshot()
+        self.assertNoFullScans(captured)
+
+    def test_service_request_export(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get("/adm/export/service-requests/?status=pending")
+            b"".join(response.streaming_content)
+        self.assertNoFullScans(captured)
+
+    def test_admin_log_retention(self):
+        with CaptureQueriesContext(connection) as captured:
+            list(AdminLog.objects.filter(timestamp__lt=timezone.now() - timedelta(days=90)))
+        self.assertNoFullScans(captured)
+
+    def test_notification_claim(self):
+        NotificationJob.objects.create(kind="NEW_REQUEST", payload={})
+        with CaptureQueriesContext(connection) as captured:
+            notifications.claim_batch("test-worker", 10)
+        self.assertNoFullScans(captured)
+
+
+# Route benchmarks. They only run when asked for, and only write a report
+# when given somewhere to put it:
+#   POWER_BENCHMARK=1 POWER_BENCHMARK_OUTPUT=benchmarks/routes.json \
+#       python manage.py test power.tests.RouteBenchmarkTests
+# Each scale seeds BENCHMARK_ROWS * scale rows in total, so the defaults
+# compare 1x against 10x the data. POWER_BENCHMARK_SCALES=1,10,100 and
+# POWER_BENCHMARK_ITERATIONS=100 make for a bigger run.
+BENCHMARK_SCALES = [
+    int(scale) for scale in os.environ.get("POWER_BENCHMARK_SCALES", "1,10").split(",")
+]
+BENCHMARK_ITERATIONS = int(os.environ.get("POWER_BENCHMARK_ITERATIONS", "20"))
+BENCHMARK_OUTPUT = os.environ.get("POWER_BENCHMARK_OUTPUT")
+# Fewer samples than this make p99 just the slowest one, so it is left out
+P99_MIN_SAMPLES = 100
+BENCHMARK_ROWS = {"requests": 200, "projects": 100, "case_studies": 20, "months": 12, "logs": 100}
+
+
+def form_data(instance, **overrides):
+    """POST data that resubmits ``instance`` through its ModelForm unchanged"""
+    data = {
+        name: value
+        for name, value in model_to_dict(instance, exclude=["id"]).items()
+        if value is not None and not isinstance(value, FieldFile)
+    }
+    return {**data, **overrides}
+
+
+@tag("benchmark")
+@skipUnless(os.environ.get("POWER_BENCHMARK"), "set POWER_BENCHMARK=1 to run the route benchmarks")
+@override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+class RouteBenchmarkTests(TestCase):
+    """
+    Request every route in power/urls.py against seeded datasets of
+    increasing size, report latency percentiles, throughput and query
+    counts per route (to BENCHMARK_OUTPUT when set), and fail if any route issues more
+    queries on the bigger datasets (an N+1 in the making).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.months_added = 0
+        # Budget warnings from ServerTimingMiddleware would drown the output
+        perf_logger = logging.getLogger("power.perf")
+        self.addCleanup(perf_logger.setLevel, perf_logger.level)
+        perf_logger.setLevel(logging.ERROR)
+
+    def fresh_month(self):
+        # MonthlyMetric.month is unique; count down from a month no seed reaches
+        self.months_added += 1
+        year, month = divmod(2500 * 12 - self.months_added, 12)
+        return date(year, month + 1, 1)
+
+    def routes(self):
+        """
+        (url name, label, method, request factory) for every benchmarked
+        request. Factories run before the timer and return (url, data).
+        """
+        service = Service.objects.order_by("display_order").first()
+        case_study = CaseStudy.objects.order_by("pk").first()
+        project = InstallationProject.objects.order_by("pk").first()
+        metric = MonthlyMetric.objects.order_by("-month").first()
+        booking = {
+            "name": "Benchmark Client",
+            "email": "bench@example.com",
+            "phone": "0700000000",
+            "service": "SEA",
+            "message": "Benchmark booking",
+        }
+
+        def get(name, *args, query=""):
+            url = reverse(name, args=args) + query
+            return lambda: (url, None)
+
+        def post(name, data, *args):
+            url = reverse(name, args=args)
+            return lambda: (url, data() if callable(data) else data)
+
+        def pending_request():
+            pending = ServiceRequest.objects.filter(is_completed=False).order_by("pk").first()
+            return reverse("mark_request_completed", args=[pending.pk]), None
+
+        def doomed_case_study():
+            doomed = CaseStudy.objects.create(
+                **form_data(case_study, service=case_study.service, title="Delete me")
+            )
+            return reverse("delete_case_study", args=[doomed.pk]), None
+
+        def metrics_csv():
+            upload = SimpleUploadedFile(
+                "metrics.csv",
+                f"month,new_clients,revenue,expenses\n{metric.month},3,1000.00,400.00\n".encode(),
+                content_type="text/csv",
+            )
+            return {"kind": "metrics", "file": upload}
+
+        routes = [
+            ("home", "home", "GET", get("home")),
+            ("home", "home POST", "POST", post("home", booking)),
+            ("booking_success", "booking_success", "GET", get("booking_success")),
+            ("all_services", "all_services", "GET", get("all_services")),
+            ("case_studies", "case_studies", "GET", get("case_studies")),
+            (
+                "case_studies",
+                "case_studies filtered",
+                "GET",
+                get(
+                    "case_studies",
+                    query=f"?client_type={case_study.client_type}&service={case_study.service.slug}"
+                    "&capacity=10-50&page=2",
+                ),
+            ),
+            (
+                "case_study_detail",
+                "case_study_detail",
+                "GET",
+                get("case_study_detail", case_study.pk),
+            ),
+            ("about", "about", "GET", get("about")),
+            ("contact", "contact", "GET", get("contact")),
+            ("contact", "contact POST", "POST", post("contact", booking)),
+            ("privacy_policy", "privacy_policy", "GET", get("privacy_policy")),
+            ("terms_conditions", "terms_conditions", "GET", get("terms_conditions")),
+            ("disclaimer", "disclaimer", "GET", get("disclaimer")),
+            ("adm_dashboard", "adm_dashboard", "GET", get("adm_dashboard")),
+            ("business_analytics", "business_analytics", "GET", get("business_analytics")),
+            ("performance", "performance", "GET", get("performance")),
+            ("service_list", "service_list", "GET", get("service_list")),
+            ("edit_service", "edit_service", "GET", get("edit_service", service.slug)),
+            (
+                "edit_service",
+                "edit_service POST",
+                "POST",
+                post("edit_service", form_data(service), service.slug),
+            ),
+            ("case_study_list", "case_study_list", "GET", get("case_study_list")),
+            ("add_case_study", "add_case_study", "GET", get("add_case_study")),
+            (
+                "add_case_study",
+                "add_case_study POST",
+                "POST",
+                post("add_case_study", form_data(case_study)),
+            ),
+            (
+                "edit_case_study",
+                "edit_case_study",
+                "GET",
+                get("edit_case_study", case_study.pk),
+            ),
+            (
+                "edit_case_study",
+                "edit_case_study POST",
+                "POST",
+                post("edit_case_study", form_data(case_study), case_study.pk),
+            ),
+            (
+                "delete_case_study",
+                "delete_case_study",
+                "GET",
+                get("delete_case_study", case_study.pk),
+            ),
+            ("delete_case_study", "delete_case_study POST", "POST", doomed_case_study),
+            ("service_request_list", "service_request_list", "GET", get("service_request_list")),
+            (
+                "service_request_list",
+                "service_request_list filtered",
+                "GET",
+                get("service_request_list", query="?status=pending&service=SEA"),
+            ),
+            (
+                "service_request_list",
+                "service_request_list search",
+                "GET",
+                get("service_request_list", query="?q=wanj+kim"),
+            ),
+            ("mark_request_completed", "mark_request_completed POST", "POST", pending_request),
+            ("project_list", "project_list", "GET", get("project_list")),
+            ("add_project", "add_project", "GET", get("add_project")),
+            (
+                "add_project",
+                "add_project POST",
+                "POST",
+                post("add_project", form_data(project)),
+            ),
+            ("edit_project", "edit_project", "GET", get("edit_project", project.pk)),
+            (
+                "edit_project",
+                "edit_project POST",
+                "POST",
+                post("edit_project", form_data(project), project.pk),
+            ),
+            ("monthly_metrics", "monthly_metrics", "GET", get("monthly_metrics")),
+            ("add_monthly_metric", "add_monthly_metric", "GET", get("add_monthly_metric")),
+            (
+                "add_monthly_metric",
+                "add_monthly_metric POST",
+                "POST",
+                post(
+                    "add_monthly_metric",
+                    lambda: form_data(metric, month=self.fresh_month()),
+                ),
+            ),
+            ("import_data", "import_data", "GET", get("import_data")),
+            ("import_data", "import_data POST", "POST", post("import_data", metrics_csv)),
+        ]
+        routes += [
+            ("chart_data", f"chart_data {chart}", "GET", get("chart_data", chart))
+            for chart in ("yearly", "monthly", "services", "client-types")
+        ]
+        routes += [
+            ("export_data", f"export_data {kind}", "GET", get("export_data", kind))
+            for kind in ("service-requests", "projects", "metrics")
+        ]
+        return routes
+
+    def measure(self, method, make_request):
+        url, data = make_request()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            if method == "POST":
+                response = self.client.post(url, data)
+            else:
+                response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        self.assertIn(response.status_code, (200, 302), f"{method} {url}")
+        # A POST whose form comes back with errors never took the write path
+        form = response.context and response.context.get("form")
+        self.assertFalse(form and form.errors, f"{method} {url}: {form and form.errors}")
+        return elapsed, len(captured)
+
+    def benchmark(self, routes):
+        results = {}
+        for _, label, method, make_request in routes:
+            # Start every route cold so query counts compare like for like
+            cache.clear()
+            timings, queries = [], []
+            for _ in range(BENCHMARK_ITERATIONS):
+                elapsed, count = self.measure(method, make_request)
+                timings.append(elapsed * 1000)
+                queries.append(count)
+            results[label] = {
+                "method": method,
+                "p50_ms": round(_percentile(timings, 0.50), 2),
+                "p95_ms": round(_percentile(timings, 0.95), 2),
+                "p99_ms": (
+                    round(_percentile(timings, 0.99), 2)
+                    if len(timings) >= P99_MIN_SAMPLES
+                    else None
+                ),
+                "throughput_rps": round(len(timings) / (sum(timings) / 1000), 1),
+                "queries": max(queries),
+                "queries_warm": min(queries),
+            }
+        return results
+
+    def test_routes(self):
+        runs = []
+        seeded = 0
+        for scale in sorted(BENCHMARK_SCALES):
+            # Top the data up to this scale; each step draws from its own seed
+            counts = seeding.seed(
+                **{kind: rows * (scale - seeded) for kind, rows in BENCHMARK_ROWS.items()},
+                seed=scale,
+                years=max(1, scale * BENCHMARK_ROWS["months"] // 12),
+            )
+            seeded = scale
+            routes = self.routes()
+            runs.append(
+                {
+                    "scale": scale,
+                    "rows": {
+                        model.__name__: model.objects.count()
+                        for model in (
+                            ServiceRequest,
+                            InstallationProject,
+                            CaseStudy,
+                            MonthlyMetric,
+                            AdminLog,
+                        )
+                    },
+                    "seeded": counts,
+                    "routes": self.benchmark(routes),
+                }
+            )
+
+        if BENCHMARK_OUTPUT:
+            output = Path(BENCHMARK_OUTPUT)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(
+                json.dumps(
+                    {
+                        "generated_at": timezone.now().isoformat(),
+                        "database": connection.vendor,
+                        "iterations": BENCHMARK_ITERATIONS,
+                        "runs": runs,
+                    },
+                    indent=2,
+                )
+            )
+
+        covered = {name for name, *_ in routes}
+        every_route = {pattern.name for pattern in power_urls.urlpatterns}
+        self.assertEqual(every_route - covered, set(), "Routes missing from the benchmark")
+
+        smallest, largest = runs[0], runs[-1]
+        for label, result in largest["routes"].items():
+            with self.subTest(route=label):
+                self.assertLessEqual(
+                    result["queries"],
+                    smallest["routes"][label]["queries"],
+                    f"{label} issues more queries with {largest['scale']}x the data",
+                )
@@ -11,6 +11,7 @@ urlpatterns = [
     # Services
     path("services/", views.all_services, name="all_services"),
     # Case Studies
+    path("case-studies/", views.case_studies, name="case_studies"),
     path("case-studies/<int:id>/", views.case_study_detail, name="case_study_detail"),
     # ESG Resources
     # path("esg-resources/", views.esg_resources, name="esg_resources"),
@@ -28,6 +29,8 @@ urlpatterns = [
     
     path('adm/dashboard/', views.admin_dashboard, name='adm_dashboard'),
     path('adm/analytics/', views.business_analytics, name='business_analytics'),
+    path('adm/analytics/charts/<slug:chart>/', views.chart_data, name='chart_data'),
+    path('adm/perf/', views.performance, name='performance'),
     
     # Service management
     path('adm/services/', views.service_list, name='service_list'),
@@ -51,6 +54,12 @@ urlpatterns = [
     # Monthly metrics
     path('adm/metrics/', views.monthly_metrics, name='monthly_metrics'),
     path('adm/metrics/add/', views.add_monthly_metric, name='add_monthly_metric'),
+
+    # Bulk CSV import
+    path('adm/import/', views.import_data, name='import_data'),
+
+    # Streaming CSV exports
+    path('adm/export/<slug:kind>/', views.export_data, name='export_data'),
 ]
 
 
@@ -0,0 +1,17 @@
+# power/utils.py
+from datetime import timedelta
+
+
+def calculate_growth_rate(current, previous):
+    """Calculate percentage growth rate between two values"""
+    if previous == 0:
+        return 0
+    return round(((current - previous) / previous) * 100, 1)
+
+
+def month_bounds(now):
+    """Return the start of last month, this month and next month"""
+    this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month = (this_month - timedelta(days=1)).replace(day=1)
+    next_month = (this_month + timedelta(days=32)).replace(day=1)
+    return last_month, this_month, next_month
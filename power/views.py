@@ -10,39 +10,108 @@ from .forms import ServiceRequestForm
 
 import logging
 
+from . import audit, search
+from .caching import atag_version, cache_public_page
+from .routers import reporting_view
+
 logger = logging.getLogger(__name__)
 
 
 # Add this to the top of views.py
-from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+from pathlib import Path
 
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
 
-@require_http_methods(["POST"])
-def update_chart_data(request):
-    chart_type = request.POST.get("chart_type")
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_http_methods
 
-    # You would implement specific data fetching logic here
-    # For now, we'll just return a success response
-    return JsonResponse({"status": "success"})
+# Newest template on disk, so a deploy that only changes markup still
+# invalidates the validators used for conditional GETs
+TEMPLATES_MODIFIED = datetime.fromtimestamp(
+    max(path.stat().st_mtime for path in (Path(__file__).parent / "templates").rglob("*.html")),
+    tz=dt_timezone.utc,
+)
 
 
-def home(request):
-    services = Service.objects.all()
-    featured_cases = CaseStudy.objects.filter(featured_image__isnull=False)[:3]
-
+async def home(request):
     form = ServiceRequestForm(request.POST or None)
     if request.method == "POST" and form.is_valid():
-        form.save()
+        await sync_to_async(form.save)()
         # messages.success(
         #     request, "✅ Booking submitted successfully! We'll contact you shortly."
         # )
         return redirect("booking_success")  # You can add a success message later
 
-    return render(
+    # Loads the session asynchronously, so the template's {% if messages %}
+    # never falls back to a blocking session query
+    await request.auser()
+    # The page is cached in fragments around the CSRF-bearing form. The
+    # {% cache %} tag reads the cache synchronously, so render off the
+    # event loop.
+    return await sync_to_async(render)(
         request,
         "cust/index.html",
-        {"services": services, "case_studies": featured_cases, "form": form},
+        {
+            "form": form,
+            "cache_version": await atag_version("Service", "CaseStudy"),
+        },
+    )
+
+
+def async_condition(validators):
+    """
+    ``condition`` for async views. ``validators`` is awaited once per request
+    for (etag, last_modified); Django's decorator would call its functions
+    synchronously, on the event loop.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            etag, last_modified = await validators(request, *args, **kwargs)
+            conditional_view = condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: last_modified,
+            )(view)
+            return await conditional_view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def content_validators(request):
+    """
+    Last-Modified/ETag inputs for pages built from Service and CaseStudy.
+
+    The newest updated_at drives Last-Modified; row counts go into the ETag
+    so deletions also change it, and the template timestamp covers deploys
+    that change markup without touching data.
+    """
+    services = await Service.objects.aaggregate(latest=Max("updated_at"), total=Count("id"))
+    cases = await CaseStudy.objects.aaggregate(latest=Max("updated_at"), total=Count("id"))
+    stamps = [TEMPLATES_MODIFIED, services["latest"], cases["latest"]]
+    last_modified = max(stamp for stamp in stamps if stamp)
+    return (
+        f"{last_modified.timestamp()}-{services['total']}-{cases['total']}",
+        last_modified,
+    )
+
+
+async def case_study_validators(request, id):
+    row = await (
+        CaseStudy.objects.filter(pk=id)
+        .values_list("updated_at", "service__updated_at")
+        .afirst()
+    )
+    last_modified = max([TEMPLATES_MODIFIED, *row]) if row else None
+    return (
+        f"{id}-{last_modified.timestamp()}" if last_modified else None,
+        last_modified,
     )
 
 
@@ -50,9 +119,13 @@ def booking_success(request):
     return render(request, "cust/booking_success.html")
 
 
-def all_services(request):
-    services = Service.objects.all()
-    recent_projects = CaseStudy.objects.order_by("-installation_date")[:4]
+@async_condition(content_validators)
+@cache_public_page("Service", "CaseStudy")
+async def all_services(request):
+    services = [service async for service in Service.objects.all()]
+    recent_projects = [
+        case async for case in CaseStudy.objects.order_by("-installation_date")[:4]
+    ]
     return render(
         request,
         "cust/services.html",
@@ -60,17 +133,90 @@ def all_services(request):
     )
 
 
-def case_study_detail(request, id):
-    case = get_object_or_404(CaseStudy, pk=id)
+@async_condition(case_study_validators)
+@cache_public_page("Service", "CaseStudy")
+async def case_study_detail(request, id):
+    case = await aget_object_or_404(CaseStudy.objects.select_related("service"), pk=id)
     return render(request, "cust/case_detail.html", {"case": case})
 
 
+from . import facets
+from .forms import CaseStudyFilterForm
+from .pagination import CountedPaginator
+
+CASE_STUDIES_PER_PAGE = 12
+
+
+def facet_groups(request, form, counts):
+    """Facet values to show, each with its result count and a toggle link"""
+    selected = form.selected
+    groups = []
+    for name, field in form.fields.items():
+        options = []
+        for value, label in field.choices[1:]:
+            key = form.services[value].pk if name == "service" else value
+            is_selected = selected.get(name) == key
+            count = counts[name].get(key, 0)
+            if not count and not is_selected:
+                continue
+            params = request.GET.copy()
+            params.pop("page", None)
+            if is_selected:
+                params.pop(name, None)
+            else:
+                params[name] = value
+            options.append(
+                {
+                    "label": label,
+                    "count": count,
+                    "selected": is_selected,
+                    "url": f"?{params.urlencode()}",
+                }
+            )
+        groups.append({"label": field.label, "options": options})
+    return groups
+
+
+@async_condition(content_validators)
+@cache_public_page(
+    "Service", "CaseStudy",
+    query_params=("client_type", "service", "capacity", "savings", "page"),
+)
+async def case_studies(request):
+    services = [service async for service in Service.objects.all()]
+    form = CaseStudyFilterForm(request.GET, services=services)
+    selected = form.selected
+    # Facet counts and the result total both come from the facet table, so
+    # the case studies themselves are only queried for the page shown
+    counts, total = await facets.facet_counts(selected)
+    paginator = CountedPaginator(
+        facets.filter_case_studies(
+            CaseStudy.objects.select_related("service"), selected
+        ).order_by("-installation_date", "-id"),
+        CASE_STUDIES_PER_PAGE,
+        count=total,
+    )
+    page = paginator.get_page(request.GET.get("page"))
+    page.object_list = [case async for case in page.object_list]
+    return render(
+        request,
+        "cust/case_studies.html",
+        {
+            "page": page,
+            "total": total,
+            "facet_groups": facet_groups(request, form, counts),
+            "filtered": bool(selected),
+        },
+    )
+
+
 # def esg_resources(request):
 #     resources = ESGResource.objects.filter(is_featured=True)
 #     return render(request, "cust/esg_resources.html", {"resources": resources})
 
 
-def about(request):
+@cache_public_page()
+async def about(request):
     return render(request, "cust/about.html")
 
 
@@ -79,7 +225,7 @@ from django.shortcuts import render, redirect
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from .forms import ServiceRequestForm
-from .models import ServiceRequest, AdminLog
+from .models import ServiceRequest
 
 
 def contact(request):
@@ -108,99 +254,51 @@ def contact(request):
 # power/views.py
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models.functions import TruncYear, TruncMonth
-from django.db.models import Sum, Count, Avg
-from .models import InstallationProject, MonthlyMetric
-import json
+from django.db.models import Sum, Count
+from .charts import CHARTS, get_chart_data
+from .forms import ChartRangeForm
 
 
 # power/views.py (update the analytics view)
 # power/views.py
 @staff_member_required
+@reporting_view
 def business_analytics(request):
-    yearly_data = (
-        InstallationProject.objects.annotate(year=TruncYear("completion_date"))
-        .values("year")
-        .annotate(
-            total_projects=Count("id"),
-            total_profit=Sum("profit"),
-            avg_system_size=Avg("system_size_kw"),
-            total_revenue=Sum("total_cost"),
-        )
-        .order_by("year")
-    )
-
-    # Prepare yearly chart data
-    yearly_labels = [
-        str(item["year"].year) if item["year"] else "N/A" for item in yearly_data
-    ]
-    yearly_profit_data = [float(item["total_profit"] or 0) for item in yearly_data]
-    yearly_clients_data = [item["total_projects"] or 0 for item in yearly_data]
-    yearly_revenue_data = [float(item["total_revenue"] or 0) for item in yearly_data]
-
-    # Monthly metrics (from MonthlyMetric model)
-    monthly_metrics = MonthlyMetric.objects.order_by("-month")[:12][
-        ::-1
-    ]  # Last 12 months, oldest first
-    monthly_labels = [item.month.strftime("%b %Y") for item in monthly_metrics]
-    monthly_revenue_data = [float(item.revenue) for item in monthly_metrics]
-    monthly_expenses_data = [float(item.expenses) for item in monthly_metrics]
-    monthly_profit_data = [float(item.profit) for item in monthly_metrics]
-    monthly_clients_data = [item.new_clients for item in monthly_metrics]
-
-    # Service distribution
-    service_distribution = (
-        InstallationProject.objects.values("service_type__title")
-        .annotate(count=Count("id"), total_profit=Sum("profit"))
-        .order_by("-count")
-    )
-    service_labels = [item["service_type__title"] for item in service_distribution]
-    service_data = [item["count"] for item in service_distribution]
-    service_profit_data = [float(item["total_profit"]) for item in service_distribution]
-
-    # Client types distribution
-    case_study_distribution = (
-        CaseStudy.objects.values("client_type")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
-    client_type_labels = [
-        dict(CaseStudy.CLIENT_TYPES).get(item["client_type"], item["client_type"])
-        for item in case_study_distribution
-    ]
-    client_type_data = [item["count"] for item in case_study_distribution]
-
+    # Only the shell is rendered here; each chart fetches its own data from
+    # chart_data so the page appears before any aggregate runs
     return render(
         request,
         "admin/analytics.html",
-        {
-            "yearly_labels": json.dumps(yearly_labels),
-            "yearly_profit_data": json.dumps(yearly_profit_data),
-            "yearly_clients_data": json.dumps(yearly_clients_data),
-            "yearly_revenue_data": json.dumps(yearly_revenue_data),
-            "monthly_labels": json.dumps(monthly_labels),
-            "monthly_revenue_data": json.dumps(monthly_revenue_data),
-            "monthly_expenses_data": json.dumps(monthly_expenses_data),
-            "monthly_profit_data": json.dumps(monthly_profit_data),
-            "monthly_clients_data": json.dumps(monthly_clients_data),
-            "service_labels": json.dumps(service_labels),
-            "service_data": json.dumps(service_data),
-            "service_profit_data": json.dumps(service_profit_data),
-            "client_type_labels": json.dumps(client_type_labels),
-            "client_type_data": json.dumps(client_type_data),
-        },
+        {"charts": CHARTS, "range_form": ChartRangeForm(request.GET or None)},
     )
 
 
-def privacy_policy(request):
+@staff_member_required
+@require_http_methods(["GET"])
+@reporting_view
+def chart_data(request, chart):
+    if chart not in CHARTS:
+        return JsonResponse({"error": f"Unknown chart {chart!r}"}, status=404)
+    form = ChartRangeForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+    return JsonResponse(
+        get_chart_data(chart, form.cleaned_data["start"], form.cleaned_data["end"])
+    )
+
+
+@cache_public_page()
+async def privacy_policy(request):
     return render(request, "cust/privacy_policy.html")
 
 
-def terms_conditions(request):
+@cache_public_page()
+async def terms_conditions(request):
     return render(request, "cust/terms_conditions.html")
 
 
-def disclaimer(request):
+@cache_public_page()
+async def disclaimer(request):
     return render(request, "cust/disclaimer.html")
 
 
@@ -210,7 +308,6 @@ from .models import (
     Service,
     CaseStudy,
     ServiceRequest,
-    AdminLog,
     InstallationProject,
     MonthlyMetric,
 )
@@ -219,111 +316,24 @@ from .forms import (
     CaseStudyForm,
     InstallationProjectForm,
     MonthlyMetricForm,
+    ServiceRequestFilterForm,
 )
 from django.db.models import Count, Q, F, ExpressionWrapper, fields
-from django.db.models.functions import TruncMonth, ExtractMonth
-from datetime import datetime, timedelta
+from django.db.models import Case, RowRange, Value, When, Window
+from django.db.models.functions import Lag, NthValue
+from datetime import date, datetime
 from django.utils import timezone
+from .dashboard import get_dashboard_snapshot
+from .pagination import keyset_paginate
+from .utils import calculate_growth_rate
 
 
 @login_required
+@reporting_view
 def admin_dashboard(request):
-    # Basic counts
-    total_requests = ServiceRequest.objects.count()
-    pending_requests = ServiceRequest.objects.filter(is_completed=False).count()
-    recent_requests = ServiceRequest.objects.order_by("-submitted_at")[:5]
-    admin_logs = AdminLog.objects.order_by("-timestamp")[:10]
-    total_services = Service.objects.count()
-    total_case_studies = CaseStudy.objects.count()
-    active_projects = InstallationProject.objects.count()
-
-    # Time periods for calculations
-    current_month = timezone.now().month
-    current_year = timezone.now().year
-    last_month = timezone.now().replace(day=1) - timedelta(days=1)
-    last_month_start = last_month.replace(day=1)
-
-    # Service growth calculation
-    services_this_month = Service.objects.filter(
-        created_at__month=current_month, created_at__year=current_year
-    ).count()
-    services_last_month = Service.objects.filter(
-        created_at__month=last_month.month, created_at__year=last_month.year
-    ).count()
-    service_growth = calculate_growth_rate(services_this_month, services_last_month)
-
-    # Case study growth calculation
-    case_studies_this_month = CaseStudy.objects.filter(
-        installation_date__month=current_month, installation_date__year=current_year
-    ).count()
-    case_studies_last_month = CaseStudy.objects.filter(
-        installation_date__month=last_month.month,
-        installation_date__year=last_month.year,
-    ).count()
-    case_study_growth = calculate_growth_rate(
-        case_studies_this_month, case_studies_last_month
-    )
-
-    # Project calculations
-    new_projects_this_week = InstallationProject.objects.filter(
-        completion_date__gte=timezone.now() - timedelta(days=7)
-    ).count()
-
-    # Request trend analysis
-    completed_requests_this_month = ServiceRequest.objects.filter(
-        is_completed=True,
-        submitted_at__month=current_month,
-        submitted_at__year=current_year,
-    ).count()
-
-    # Financial metrics (from InstallationProject)
-    current_year_projects = InstallationProject.objects.filter(
-        completion_date__year=current_year
-    )
-    total_revenue = (
-        current_year_projects.aggregate(total=Sum("total_cost"))["total"] or 0
-    )
-    total_profit = current_year_projects.aggregate(total=Sum("profit"))["total"] or 0
-
-    # Efficiency metrics
-    avg_project_duration = current_year_projects.annotate(
-        duration=ExpressionWrapper(
-            F("completion_date") - F("created_at"), output_field=fields.DurationField()
-        )
-    ).aggregate(avg_duration=Avg("duration"))["avg_duration"] or timedelta(0)
-
-    return render(
-        request,
-        "admin/dashboard.html",
-        {
-            # Basic counts
-            "total_requests": total_requests,
-            "pending_requests": pending_requests,
-            "recent_requests": recent_requests,
-            "admin_logs": admin_logs,
-            "total_services": total_services,
-            "total_case_studies": total_case_studies,
-            "active_projects": active_projects,
-            # Calculated metrics
-            "service_growth": service_growth,
-            "case_study_growth": case_study_growth,
-            "new_projects_this_week": new_projects_this_week,
-            "completed_requests_this_month": completed_requests_this_month,
-            "total_revenue": total_revenue,
-            "total_profit": total_profit,
-            "avg_project_duration": avg_project_duration.days,
-            # Time periods
-            "current_month": timezone.now().strftime("%B"),
-            "last_month": last_month.strftime("%B"),
-        },
-    )
-
-
-def calculate_growth_rate(current, previous):
-    """Calculate percentage growth rate between two values"""
-    if previous == 0:
-        return 0
-    return round(((current - previous) / previous) * 100, 1)
+    # All tiles come from a cached snapshot built with one aggregate query
+    # per model; power/signals.py drops it whenever the underlying data changes
+    return render(request, "admin/dashboard.html", get_dashboard_snapshot())
 
 
 # Service Management Views
@@ -340,10 +350,10 @@ def edit_service(request, slug):
         form = ServiceForm(request.POST, request.FILES, instance=service)
         if form.is_valid():
             form.save()
-            AdminLog.objects.create(
-                admin_user=request.user.username,
-                action="EDIT",
-                details=f"Edited service: {service.title}",
+            audit.log_action(
+                request,
+                "EDIT",
+                f"Edited service: {service.title}",
             )
             return redirect("service_list")
     else:
@@ -357,7 +367,7 @@ def edit_service(request, slug):
 # Case Study Management Views
 @login_required
 def case_study_list(request):
-    case_studies = CaseStudy.objects.all()
+    case_studies = CaseStudy.objects.select_related("service")
     return render(request, "admin/case_study_list.html", {"case_studies": case_studies})
 
 
@@ -367,10 +377,10 @@ def add_case_study(request):
         form = CaseStudyForm(request.POST, request.FILES)
         if form.is_valid():
             case_study = form.save()
-            AdminLog.objects.create(
-                admin_user=request.user.username,
-                action="EDIT",
-                details=f"Added case study: {case_study.title}",
+            audit.log_action(
+                request,
+                "EDIT",
+                f"Added case study: {case_study.title}",
             )
             return redirect("case_study_list")
     else:
@@ -388,10 +398,10 @@ def edit_case_study(request, pk):
         form = CaseStudyForm(request.POST, request.FILES, instance=case_study)
         if form.is_valid():
             form.save()
-            AdminLog.objects.create(
-                admin_user=request.user.username,
-                action="EDIT",
-                details=f"Edited case study: {case_study.title}",
+            audit.log_action(
+                request,
+                "EDIT",
+                f"Edited case study: {case_study.title}",
             )
             return redirect("case_study_list")
     else:
@@ -410,10 +420,10 @@ def delete_case_study(request, pk):
     if request.method == "POST":
         title = case_study.title
         case_study.delete()
-        AdminLog.objects.create(
-            admin_user=request.user.username,
-            action="DELETE",
-            details=f"Deleted case study: {title}",
+        audit.log_action(
+            request,
+            "DELETE",
+            f"Deleted case study: {title}",
         )
         return redirect("case_study_list")
 
@@ -427,8 +437,46 @@ def delete_case_study(request, pk):
 # Service Request Management
 @login_required
 def service_request_list(request):
-    requests = ServiceRequest.objects.order_by("-submitted_at")
-    return render(request, "admin/service_request_list.html", {"requests": requests})
+    filter_form = ServiceRequestFilterForm(request.GET or None)
+    query = filter_form.search_query
+    if query:
+        # One page of the best matches, ranked by the full-text index
+        requests = search.ranked(
+            filter_form.filter_queryset(ServiceRequest.objects.all(), include_search=False),
+            query,
+        )
+        page = None
+    else:
+        # Keyset pagination on (submitted_at, id) keeps deep pages as cheap
+        # as the first one
+        requests = page = keyset_paginate(
+            filter_form.filter_queryset(ServiceRequest.objects.all()),
+            "submitted_at",
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+        )
+
+    # Pending/completed badges reflect every filter except status itself
+    status_counts = dict(
+        filter_form.filter_queryset(ServiceRequest.objects.all(), include_status=False)
+        .order_by()
+        .values_list("is_completed")
+        .annotate(total=Count("id"))
+    )
+
+    return render(
+        request,
+        "admin/service_request_list.html",
+        {
+            "requests": requests,
+            "page": page,
+            "query": query,
+            "search_limit": search.SEARCH_RESULTS,
+            "filter_form": filter_form,
+            "pending_count": status_counts.get(False, 0),
+            "completed_count": status_counts.get(True, 0),
+        },
+    )
 
 
 @login_required
@@ -437,74 +485,67 @@ def mark_request_completed(request, pk):
     if not service_request.is_completed:
         service_request.is_completed = True
         service_request.save()
-        AdminLog.objects.create(
-            admin_user=request.user.username,
-            action="EDIT",
-            details=f"Marked request as completed: {service_request.name} - {service_request.get_service_display()}",
+        audit.log_action(
+            request,
+            "EDIT",
+            f"Marked request as completed: {service_request.name} - {service_request.get_service_display()}",
         )
     return redirect("service_request_list")
 
 
 # Installation Project Views
 @login_required
+@reporting_view
 def project_list(request):
-    # Get all projects ordered by completion date (newest first)
-    projects = InstallationProject.objects.order_by("-completion_date")
-    
-    # Calculate totals and growth rates
-    if projects.exists():
-        current_year = timezone.now().year
-        last_year = current_year - 1
-        
-        # Total calculations
-        total_projects = projects.count()
-        total_revenue = projects.aggregate(total=Sum('total_cost'))['total'] or 0
-        total_profit = projects.aggregate(total=Sum('profit'))['total'] or 0
-        
-        # Current year projects
-        current_year_projects = projects.filter(completion_date__year=current_year)
-        current_year_count = current_year_projects.count()
-        current_year_revenue = current_year_projects.aggregate(total=Sum('total_cost'))['total'] or 0
-        current_year_profit = current_year_projects.aggregate(total=Sum('profit'))['total'] or 0
-        
-        # Last year projects (for growth comparison)
-        last_year_projects = projects.filter(completion_date__year=last_year)
-        last_year_count = last_year_projects.count()
-        last_year_revenue = last_year_projects.aggregate(total=Sum('total_cost'))['total'] or 0
-        last_year_profit = last_year_projects.aggregate(total=Sum('profit'))['total'] or 0
-        
-        # Growth rate calculations
-        growth_rate = calculate_growth_rate(current_year_count, last_year_count)
-        revenue_growth = calculate_growth_rate(current_year_revenue, last_year_revenue)
-        profit_growth = calculate_growth_rate(current_year_profit, last_year_profit)
-        
-        # Add status and featured flags to each project
-        for project in projects:
-            project.status = 'completed'  # Default status since we only have completion_date
-            project.is_featured = False  # Default to not featured
-    else:
-        total_projects = 0
-        total_revenue = 0
-        total_profit = 0
-        growth_rate = 0
-        revenue_growth = 0
-        profit_growth = 0
-    
+    current_year = timezone.now().year
+    last_year = current_year - 1
+    this_year_q = Q(
+        completion_date__gte=date(current_year, 1, 1),
+        completion_date__lt=date(current_year + 1, 1, 1),
+    )
+    last_year_q = Q(
+        completion_date__gte=date(last_year, 1, 1),
+        completion_date__lt=date(current_year, 1, 1),
+    )
+
+    # Totals and year-over-year figures in a single aggregate query
+    totals = InstallationProject.objects.aggregate(
+        total_projects=Count("id"),
+        total_revenue=Sum("total_cost"),
+        total_profit=Sum("profit"),
+        current_year_count=Count("id", filter=this_year_q),
+        current_year_revenue=Sum("total_cost", filter=this_year_q),
+        current_year_profit=Sum("profit", filter=this_year_q),
+        last_year_count=Count("id", filter=last_year_q),
+        last_year_revenue=Sum("total_cost", filter=last_year_q),
+        last_year_profit=Sum("profit", filter=last_year_q),
+    )
+
+    # Newest completions first, one page at a time, with the service joined in
+    projects = keyset_paginate(
+        InstallationProject.objects.select_related("service_type"),
+        "completion_date",
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
+
     return render(request, "admin/project_list.html", {
         "projects": projects,
-        "total_projects": total_projects,
-        "total_revenue": total_revenue,
-        "total_profit": total_profit,
-        "growth_rate": growth_rate,
-        "revenue_growth": revenue_growth,
-        "profit_growth": profit_growth,
+        "page": projects,
+        "total_projects": totals["total_projects"],
+        "total_revenue": totals["total_revenue"] or 0,
+        "total_profit": totals["total_profit"] or 0,
+        "growth_rate": calculate_growth_rate(
+            totals["current_year_count"], totals["last_year_count"]
+        ),
+        "revenue_growth": calculate_growth_rate(
+            totals["current_year_revenue"] or 0, totals["last_year_revenue"] or 0
+        ),
+        "profit_growth": calculate_growth_rate(
+            totals["current_year_profit"] or 0, totals["last_year_profit"] or 0
+        ),
     })
 
-def calculate_growth_rate(current, previous):
-    """Calculate percentage growth rate between two values"""
-    if previous == 0:
-        return 0
-    return round(((current - previous) / previous) * 100, 1)
 
 @login_required
 def add_project(request):
@@ -512,10 +553,10 @@ def add_project(request):
         form = InstallationProjectForm(request.POST)
         if form.is_valid():
             project = form.save()
-            AdminLog.objects.create(
-                admin_user=request.user.username,
-                action="EDIT",
-                details=f"Added project: {project.client_name}",
+            audit.log_action(
+                request,
+                "EDIT",
+                f"Added project: {project.client_name}",
             )
             return redirect("project_list")
     else:
@@ -533,10 +574,10 @@ def edit_project(request, pk):
         form = InstallationProjectForm(request.POST, instance=project)
         if form.is_valid():
             form.save()
-            AdminLog.objects.create(
-                admin_user=request.user.username,
-                action="EDIT",
-                details=f"Edited project: {project.client_name}",
+            audit.log_action(
+                request,
+                "EDIT",
+                f"Edited project: {project.client_name}",
             )
             return redirect("project_list")
     else:
@@ -547,40 +588,107 @@ def edit_project(request, pk):
     )
 
 
+METRICS_PAGE_SIZE = 24
+
+
+def annotated_monthly_metrics():
+    """
+    MonthlyMetric rows, newest first, with profit, margin, month-over-month
+    growth and the all-time totals computed by the database.
+
+    Every row carries the totals and the latest/previous month figures as
+    window values, so a single query feeds both the table and the summary
+    cards. Window functions run before LIMIT/OFFSET, so slicing a page does
+    not break the LAG against the month just outside it.
+    """
+    net_profit = ExpressionWrapper(
+        F("revenue") - F("expenses"), output_field=fields.DecimalField()
+    )
+    by_month = F("month").asc()
+    newest_first = F("month").desc()
+    whole_table = RowRange(start=None, end=None)
+
+    def latest(field, nth):
+        return Window(
+            NthValue(field, nth=nth), order_by=newest_first, frame=whole_table
+        )
+
+    return (
+        MonthlyMetric.objects.annotate(net_profit=net_profit)
+        .annotate(
+            profit_margin=Case(
+                When(revenue=0, then=Value(0.0)),
+                default=ExpressionWrapper(
+                    F("net_profit") * 100.0 / F("revenue"),
+                    output_field=fields.FloatField(),
+                ),
+                output_field=fields.FloatField(),
+            ),
+            previous_revenue=Window(Lag("revenue"), order_by=by_month),
+            total_revenue=Window(Sum("revenue")),
+            total_profit=Window(Sum("net_profit")),
+            total_clients=Window(Sum("new_clients")),
+            total_months=Window(Count("id")),
+            latest_revenue=latest("revenue", 1),
+            previous_month_revenue=latest("revenue", 2),
+            latest_profit=latest("net_profit", 1),
+            previous_month_profit=latest("net_profit", 2),
+            latest_clients=latest("new_clients", 1),
+            previous_month_clients=latest("new_clients", 2),
+        )
+        .annotate(
+            revenue_growth=Case(
+                When(
+                    Q(previous_revenue__isnull=True) | Q(previous_revenue=0),
+                    then=Value(None),
+                ),
+                default=ExpressionWrapper(
+                    (F("revenue") - F("previous_revenue"))
+                    * 100.0
+                    / F("previous_revenue"),
+                    output_field=fields.FloatField(),
+                ),
+                output_field=fields.FloatField(),
+            )
+        )
+        .order_by("-month")
+    )
+
+
 @login_required
+@reporting_view
 def monthly_metrics(request):
-    # Get all metrics ordered by month (newest first)
-    metrics = MonthlyMetric.objects.order_by("-month")
-    
-    # Calculate totals and growth rates
-    if metrics.exists():
-        current_month = metrics.first()
-        previous_month = metrics[1] if len(metrics) > 1 else None
-        
-        # Total calculations
-        total_revenue = sum(m.revenue for m in metrics)
-        total_profit = sum(m.profit for m in metrics)
-        total_clients = sum(m.new_clients for m in metrics)
-        
-        # Growth rate calculations
+    try:
+        page_number = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page_number = 1
+    offset = (page_number - 1) * METRICS_PAGE_SIZE
+
+    # One query: the page of rows, each carrying the totals as window values
+    metrics = list(annotated_monthly_metrics()[offset : offset + METRICS_PAGE_SIZE])
+    if not metrics and page_number > 1:
+        # Past the end: show the last page rather than an empty one with
+        # every total at zero
+        last_page = -(-MonthlyMetric.objects.count() // METRICS_PAGE_SIZE)
+        page_number = max(last_page, 1)
+        offset = (page_number - 1) * METRICS_PAGE_SIZE
+        metrics = list(annotated_monthly_metrics()[offset : offset + METRICS_PAGE_SIZE])
+
+    if metrics:
+        summary = metrics[0]
+        total_revenue = summary.total_revenue or 0
+        total_profit = summary.total_profit or 0
+        total_clients = summary.total_clients or 0
         revenue_growth = calculate_growth_rate(
-            current_month.revenue,
-            previous_month.revenue if previous_month else 0
+            summary.latest_revenue, summary.previous_month_revenue or 0
         )
-        
         profit_growth = calculate_growth_rate(
-            current_month.profit,
-            previous_month.profit if previous_month else 0
+            summary.latest_profit, summary.previous_month_profit or 0
         )
-        
         client_growth = calculate_growth_rate(
-            current_month.new_clients,
-            previous_month.new_clients if previous_month else 0
+            summary.latest_clients, summary.previous_month_clients or 0
         )
-        
-        # Add profit margin to each metric
-        for metric in metrics:
-            metric.profit_margin = (metric.profit / metric.revenue * 100) if metric.revenue != 0 else 0
+        has_next = offset + len(metrics) < summary.total_months
     else:
         total_revenue = 0
         total_profit = 0
@@ -588,9 +696,13 @@ def monthly_metrics(request):
         revenue_growth = 0
         profit_growth = 0
         client_growth = 0
-    
+        has_next = False
+
     return render(request, "admin/monthly_metrics.html", {
         "metrics": metrics,
+        "page_number": page_number,
+        "has_previous": page_number > 1,
+        "has_next": has_next,
         "total_revenue": total_revenue,
         "total_profit": total_profit,
         "total_clients": total_clients,
@@ -599,12 +711,6 @@ def monthly_metrics(request):
         "client_growth": client_growth,
     })
 
-def calculate_growth_rate(current, previous):
-    """Calculate percentage growth rate between two values"""
-    if previous == 0:
-        return 0
-    return round(((current - previous) / previous) * 100, 1)
-
 
 @login_required
 def add_monthly_metric(request):
@@ -612,10 +718,10 @@ def add_monthly_metric(request):
         form = MonthlyMetricForm(request.POST)
         if form.is_valid():
             metric = form.save()
-            AdminLog.objects.create(
-                admin_user=request.user.username,
-                action="EDIT",
-                details=f"Added monthly metric for {metric.month.strftime('%B %Y')}",
+            audit.log_action(
+                request,
+                "EDIT",
+                f"Added monthly metric for {metric.month.strftime('%B %Y')}",
             )
             return redirect("monthly_metrics")
     else:
@@ -624,3 +730,77 @@ def add_monthly_metric(request):
     return render(
         request, "admin/edit_metric.html", {"form": form, "title": "Add Monthly Metric"}
     )
+
+
+# power/views.py
+import io
+
+from django.core.exceptions import ValidationError
+
+from .forms import CsvImportForm
+from .imports import import_csv
+
+
+@login_required
+def import_data(request):
+    report = None
+    if request.method == "POST":
+        form = CsvImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            kind = form.cleaned_data["kind"]
+            # Large uploads are spooled to a temporary file by Django and
+            # parsed row by row from there
+            stream = io.TextIOWrapper(
+                form.cleaned_data["file"].file, encoding="utf-8-sig", newline=""
+            )
+            try:
+                report = import_csv(kind, stream)
+            except ValidationError as e:
+                form.add_error("file", e)
+            except UnicodeDecodeError:
+                form.add_error("file", "The file is not UTF-8 encoded text.")
+            else:
+                audit.log_action(
+                    request,
+                    "EDIT",
+                    f"Imported {report.imported} {dict(form.KIND_CHOICES)[kind].lower()} from CSV",
+                )
+    else:
+        form = CsvImportForm(initial={"kind": request.GET.get("kind")})
+
+    return render(request, "admin/import_csv.html", {"form": form, "report": report})
+
+
+# power/views.py
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+
+from .exports import EXPORTS, acsv_lines, csv_lines, export_filename
+
+
+@login_required
+def export_data(request, kind):
+    """Stream a CSV export; rows are read in chunks, never all at once"""
+    if kind not in EXPORTS:
+        raise Http404("Unknown export")
+    # Each server streams only its own kind of iterator
+    lines = acsv_lines if isinstance(request, ASGIRequest) else csv_lines
+    response = StreamingHttpResponse(
+        lines(EXPORTS[kind](request)), content_type="text/csv; charset=utf-8"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(kind)}"'
+    return response
+
+
+# power/views.py
+from .perf import HISTORY_SIZE, recent_stats
+
+
+@staff_member_required
+def performance(request):
+    stats, sample_size = recent_stats()
+    return render(
+        request,
+        "admin/performance.html",
+        {"stats": stats, "sample_size": sample_size, "history_size": HISTORY_SIZE},
+    )